@@ -0,0 +1,103 @@
+# app.py
+# Streamlit frontend for the assistant API. Answers are read from the /…/stream endpoints
+# so text appears while it is generated.
+# Run with:  streamlit run app.py   (backend: uvicorn main:app --port 8000)
+
+import json
+import os
+import uuid
+
+import requests
+import streamlit as st
+
+BACKEND_URL = os.getenv("ASSISTANT_BACKEND_URL", "http://127.0.0.1:8000")
+
+st.set_page_config(page_title="🧠 Personal AI Assistant", layout="wide")
+st.title("🧠 Personal AI Assistant")
+
+
+def iter_sse(response):
+    """
+    Yield (event, data) pairs from a text/event-stream response.
+    """
+    event, data = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].strip())
+
+
+def show_stream(response, render_final):
+    """
+    Render tokens live, agent steps in an expander, and the final event with `render_final`.
+    """
+    if response.status_code != 200:
+        st.error(f"Error from backend: {response.text}")
+        return
+    steps = st.expander("Agent steps", expanded=False)
+    placeholder = st.empty()
+    text = ""
+    for event, data in iter_sse(response):
+        if event == "token":
+            text += data["text"]
+            placeholder.markdown(text + "▌")
+        elif event == "tool_start":
+            steps.markdown(f"**→ {data['tool']}**: `{data['input']}`")
+        elif event == "tool_end":
+            steps.text(str(data["output"])[:2000])
+        elif event == "final":
+            placeholder.empty()
+            render_final(data)
+        elif event == "error":
+            placeholder.empty()
+            st.error(data["detail"])
+
+
+# One conversation per browser session, so follow-up searches see earlier turns
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
+
+search_tab, doc_tab, email_tab = st.tabs(["🔎 Web search", "📄 Document Q&A", "✉️ Email draft"])
+
+with search_tab:
+    query = st.text_input("Search the web:")
+    if st.button("Search") and query.strip():
+        with requests.get(f"{BACKEND_URL}/search/stream", params={"q": query, "session_id": st.session_state["session_id"]}, stream=True, timeout=300) as response:
+            show_stream(response, lambda data: st.success(data["answer"]))
+
+with doc_tab:
+    uploaded_file = st.file_uploader("Upload a document (PDF)", type="pdf")
+    if uploaded_file and st.button("Upload"):
+        response = requests.post(f"{BACKEND_URL}/upload_document", files={"file": uploaded_file})
+        if response.status_code in (200, 202):
+            st.session_state["store_id"] = response.json()["store_id"]
+            st.info(f"Stored as {st.session_state['store_id']} — ingestion status: {response.json().get('status', 'ready')}")
+        else:
+            st.error(f"Upload failed: {response.text}")
+
+    question = st.text_input("Ask a question about your documents:")
+    only_latest = st.checkbox("Only the last uploaded document", value="store_id" in st.session_state)
+    if st.button("Get Answer") and question.strip():
+        params = {"q": question}
+        if only_latest and "store_id" in st.session_state:
+            params["store_id"] = st.session_state["store_id"]
+        with requests.get(f"{BACKEND_URL}/doc_qa/stream", params=params, stream=True, timeout=300) as response:
+            show_stream(response, lambda data: st.success(data["answer"]))
+
+with email_tab:
+    to = st.text_input("To:")
+    purpose = st.text_input("Purpose:")
+    context = st.text_area("Context:")
+    tone = st.selectbox("Tone:", ["polite", "formal", "friendly"])
+    length = st.selectbox("Length:", ["short", "medium", "long"], index=1)
+    if st.button("Draft") and to.strip() and purpose.strip():
+        form = {"to": to, "purpose": purpose, "context": context, "tone": tone, "length": length}
+        with requests.post(f"{BACKEND_URL}/draft_email/stream", data=form, stream=True, timeout=300) as response:
+            show_stream(response, lambda data: st.text_area("Draft", f"Subject: {data['subject']}\n\n{data['body']}", height=300))
@@ -0,0 +1,81 @@
+# benchmarks/bench_embeddings.py
+"""
+Latency and retrieval recall of the embedding providers on the sample PDFs in data/uploads.
+Each chunk is paired with a query made from a window of its own words; recall@k is the share
+of queries whose source chunk is among the k nearest chunks by cosine similarity.
+The remote provider is only measured when GOOGLE_API_KEY is set.
+Run from the assistant/ directory:  python benchmarks/bench_embeddings.py
+"""
+import hashlib
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from features.doc_qa.pages import iter_pdf_pages, split_pages
+
+UPLOADS = Path(__file__).resolve().parents[1] / "data" / "uploads"
+
+
+def load_chunks():
+    seen, chunks = set(), []
+    for path in sorted(UPLOADS.glob("*.pdf")):
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        chunks.extend(doc.page_content for doc in split_pages(iter_pdf_pages(str(path)), chunk_size=300, chunk_overlap=50))
+    return chunks
+
+
+def make_queries(chunks, window: int = 8, seed: int = 0):
+    rng = random.Random(seed)
+    queries = []
+    for i, chunk in enumerate(chunks):
+        words = chunk.split()
+        if len(words) < window:
+            continue
+        start = rng.randrange(len(words) - window + 1)
+        queries.append((i, " ".join(words[start:start + window])))
+    return queries
+
+
+def evaluate(embedding, chunks, queries, ks=(1, 5)):
+    start = time.perf_counter()
+    doc_vectors = np.asarray(embedding.embed_documents(chunks), dtype=np.float32)
+    doc_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    query_vectors = np.asarray([embedding.embed_query(q) for _, q in queries], dtype=np.float32)
+    query_seconds = time.perf_counter() - start
+
+    doc_vectors /= np.linalg.norm(doc_vectors, axis=1, keepdims=True) + 1e-12
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True) + 1e-12
+    ranked = np.argsort(-(query_vectors @ doc_vectors.T), axis=1)
+    targets = np.array([i for i, _ in queries])[:, None]
+    recall = {k: float((ranked[:, :k] == targets).any(axis=1).mean()) for k in ks}
+    return doc_seconds, query_seconds / max(len(queries), 1), recall
+
+
+if __name__ == "__main__":
+    from features.doc_qa.embeddings import HashingEmbeddings
+
+    chunks = load_chunks()
+    queries = make_queries(chunks)
+    print(f"{len(chunks)} chunks, {len(queries)} queries from {UPLOADS}")
+
+    providers = [("local hashing", HashingEmbeddings())]
+    if os.getenv("GOOGLE_API_KEY"):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        providers.append(("google embedding-001", GoogleGenerativeAIEmbeddings(model="models/embedding-001")))
+    else:
+        print("GOOGLE_API_KEY not set: skipping the remote provider")
+
+    print(f"{'provider':<22} {'docs total ms':>14} {'ms/query':>9} {'recall@1':>9} {'recall@5':>9}")
+    for name, embedding in providers:
+        doc_seconds, per_query, recall = evaluate(embedding, chunks, queries)
+        print(f"{name:<22} {doc_seconds * 1000:>14.1f} {per_query * 1000:>9.2f} {recall[1]:>9.2f} {recall[5]:>9.2f}")
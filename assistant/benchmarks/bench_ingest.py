@@ -0,0 +1,58 @@
+# benchmarks/bench_ingest.py
+"""
+Throughput of the batched, concurrent embedding stage against a local fake embedder.
+Run from the assistant/ directory:  python benchmarks/bench_ingest.py
+"""
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from features.doc_qa.ingest import embed_in_batches
+
+Doc = namedtuple("Doc", ["page_content", "metadata"])
+
+
+class FakeEmbedder:
+    """
+    Simulates a remote provider: fixed round-trip latency per call plus a small per-text cost.
+    """
+
+    def __init__(self, call_latency: float = 0.05, per_text: float = 0.0002, dim: int = 768):
+        self.call_latency = call_latency
+        self.per_text = per_text
+        self.dim = dim
+
+    def embed_documents(self, texts):
+        time.sleep(self.call_latency + self.per_text * len(texts))
+        return [[0.0] * self.dim for _ in texts]
+
+
+def run(num_chunks: int, batch_size: int, concurrency: int) -> float:
+    docs = (Doc(f"chunk {i} " * 50, {}) for i in range(num_chunks))
+    written = []
+    start = time.perf_counter()
+    embed_in_batches(docs, FakeEmbedder(), lambda batch, vectors: written.append(len(batch)),
+                     batch_size=batch_size, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+    assert sum(written) == num_chunks
+    return elapsed
+
+
+CONFIGS = [
+    # (batch_size, concurrency)
+    (20, 1),
+    (100, 1),
+    (100, 4),
+    (100, 8),
+    (50, 8),
+]
+
+if __name__ == "__main__":
+    num_chunks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{num_chunks} chunks, fake embedder: 50ms per call + 0.2ms per text")
+    print(f"{'batch':>6} {'workers':>8} {'seconds':>8} {'chunks/s':>10}")
+    for batch_size, concurrency in CONFIGS:
+        elapsed = run(num_chunks, batch_size, concurrency)
+        print(f"{batch_size:>6} {concurrency:>8} {elapsed:>8.2f} {num_chunks / elapsed:>10.0f}")
@@ -0,0 +1,110 @@
+# benchmarks/bench_reminder_parser.py
+"""
+Share of reminder requests the rule-based parser (features/reminder/time_parser.py) handles
+locally, its accuracy on the labelled corpus below, and per-request latency of each path.
+"Now" is fixed at Wednesday 2025-03-05 10:00 so expected times are stable.
+The LLM fallback is only timed when GOOGLE_API_KEY is set (one call per unparsed request).
+Run from the assistant/ directory:  python benchmarks/bench_reminder_parser.py
+"""
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from features.reminder.time_parser import parse_reminder
+
+NOW = datetime(2025, 3, 5, 10, 0)
+
+# (text, expected task, expected "YYYY-MM-DD HH:MM") — None when the LLM is expected to handle it
+CORPUS = [
+    ("remind me to drink water at 6 PM", "drink water", "2025-03-05 18:00"),
+    ("Remind me to call mom at 7:30pm", "call mom", "2025-03-05 19:30"),
+    ("remind me to stretch in 20 minutes", "stretch", "2025-03-05 10:20"),
+    ("remind me in 2 hours to check the oven", "check the oven", "2025-03-05 12:00"),
+    ("in an hour remind me to take the laundry out", "take the laundry out", "2025-03-05 11:00"),
+    ("remind me in half an hour to join the standup", "join the standup", "2025-03-05 10:30"),
+    ("remind me to submit the report tomorrow at 9am", "submit the report", "2025-03-06 09:00"),
+    ("tomorrow at 14:00 remind me about the dentist", "the dentist", "2025-03-06 14:00"),
+    ("remind me to pay rent on Monday at 10 am", "pay rent", "2025-03-10 10:00"),
+    ("remind me next friday at 3 pm to send the invoice", "send the invoice", "2025-03-07 15:00"),
+    ("set a reminder to water the plants at 8:15 am", "water the plants", "2025-03-06 08:15"),
+    ("remind me to take medicine at 9 PM today", "take medicine", "2025-03-05 21:00"),
+    ("remind me to book tickets on March 20 at 5pm", "book tickets", "2025-03-20 17:00"),
+    ("remind me to renew passport on 2 April", "renew passport", "2025-04-02 09:00"),
+    ("remind me on 2025-06-01 at 12:00 to file taxes", "file taxes", "2025-06-01 12:00"),
+    ("remind me to buy a gift on Jan 10", "buy a gift", "2026-01-10 09:00"),
+    ("remind me to lock the door tonight", "lock the door", "2025-03-05 20:00"),
+    ("remind me to call the bank tomorrow morning", "call the bank", "2025-03-06 09:00"),
+    ("remind me to walk the dog this evening at 7", "walk the dog", "2025-03-05 19:00"),
+    ("remind me at noon to eat lunch", "eat lunch", "2025-03-05 12:00"),
+    ("remind me to review PR 42 in 3 days", "review PR 42", "2025-03-08 10:00"),
+    ("remind me to back up the laptop on sunday", "back up the laptop", "2025-03-09 09:00"),
+    ("don't let me forget to email Sam at 4pm", "email Sam", "2025-03-05 16:00"),
+    ("reminder: team sync at 11:30 in the morning", "team sync", "2025-03-05 11:30"),
+    ("remind me to cook at 7:00 tonight", "cook", "2025-03-05 19:00"),
+    ("remind me to jog at 6:30 in the evening", "jog", "2025-03-05 18:30"),
+    ("remind me to start the backup at 02:15", "start the backup", "2025-03-06 02:15"),
+    ("remind me to check in for my flight the day after tomorrow at 6 am", "check in for my flight", "2025-03-07 06:00"),
+    ("remind me to stand up in 45 mins", "stand up", "2025-03-05 10:45"),
+    # Left to the LLM: vague or compound expressions
+    ("remind me to call grandma at 6", None, None),
+    ("remind me to call mom at 6:30", None, None),
+    ("remind me to pay the electricity bill before the end of the month", None, None),
+    ("remind me to follow up with Priya a week from Thursday", None, None),
+    ("remind me about the meeting two hours before it starts", None, None),
+    ("every monday remind me to plan the week", None, None),
+    ("remind me to buy milk when I leave work", None, None),
+    # Date phrasings the parser doesn't read: must fall back rather than drop the date
+    ("remind me to email bob at 5pm on 10/20", None, None),
+    ("remind me at 9am on the 25th to pay", None, None),
+    ("remind me to renew the lease next month", None, None),
+    ("remind me at 6pm next week to call the plumber", None, None),
+    ("remind me to clean the garage this weekend", None, None),
+    ("remind me to submit the form by end of day", None, None),
+]
+
+
+def evaluate():
+    local, correct, wrong_local = 0, 0, []
+    start = time.perf_counter()
+    results = [parse_reminder(text, now=NOW) for text, _, _ in CORPUS]
+    per_request_us = (time.perf_counter() - start) / len(CORPUS) * 1e6
+    for (text, task, when), result in zip(CORPUS, results):
+        if result is None:
+            if task is not None:
+                wrong_local.append((text, "fell back to LLM"))
+            continue
+        local += 1
+        got = (result["task"], result["remind_at"].strftime("%Y-%m-%d %H:%M"))
+        if got == (task, when):
+            correct += 1
+        else:
+            wrong_local.append((text, got))
+    return local, correct, wrong_local, per_request_us
+
+
+def time_llm(texts):
+    from features.reminder.reminder_manager import get_reminder_chain
+    chain = get_reminder_chain()
+    start = time.perf_counter()
+    for text in texts:
+        chain.invoke({"task_text": text, "current_date": NOW.strftime("%Y-%m-%d")})
+    return (time.perf_counter() - start) / max(len(texts), 1) * 1000
+
+
+if __name__ == "__main__":
+    import os
+
+    local, correct, mismatches, per_request_us = evaluate()
+    print(f"{len(CORPUS)} requests: {local} parsed locally ({local / len(CORPUS):.0%}), "
+          f"{correct}/{local} of those match the expected task and time")
+    print(f"rule-based parser: {per_request_us:.1f} µs/request")
+    for text, got in mismatches:
+        print(f"  mismatch: {text!r} -> {got}")
+
+    fallback = [text for text, _, _ in CORPUS if parse_reminder(text, now=NOW) is None]
+    if os.getenv("GOOGLE_API_KEY") and fallback:
+        print(f"LLM fallback: {time_llm(fallback):.0f} ms/request over {len(fallback)} requests")
+    else:
+        print("GOOGLE_API_KEY not set: skipping LLM fallback timing")
@@ -1,18 +1,27 @@
 # core/agent.py
 from langchain.agents import initialize_agent, AgentType
-from langchain.memory import ConversationBufferMemory
+from langchain.agents.mrkl.prompt import SUFFIX
 
-def build_agent(llm, tools, verbose: bool = False):
+# The zero-shot ReAct prompt has no history slot, so conversation memory is put in front of the question
+MEMORY_SUFFIX = "Conversation so far:\n{chat_history}\n\n" + SUFFIX
+
+def build_agent(llm, tools, verbose: bool = False, memory=None):
     """
-    Initialize a LangChain agent with memory and provided tools.
+    Initialize a LangChain agent with the provided tools.
     `tools` is a list of Tool objects (e.g. get_web_search_tool(...))
+    `memory` is the conversation memory for one session (see core/memory.py), or None for
+    a stateless agent. Agents are cheap to build, so build one per session rather than
+    sharing one memory between users.
     """
-    memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    agent_kwargs = None
+    if memory is not None:
+        agent_kwargs = {"suffix": MEMORY_SUFFIX, "input_variables": ["input", "chat_history", "agent_scratchpad"]}
     agent_executor = initialize_agent(
         tools=tools,
         llm=llm,
         agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
         verbose=verbose,
-        memory=memory
+        memory=memory,
+        agent_kwargs=agent_kwargs
     )
     return agent_executor
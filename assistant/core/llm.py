@@ -1,25 +1,45 @@
 # core/llm.py
 import os
-from langchain_community.llms import OpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+from functools import lru_cache
 from dotenv import load_dotenv
+from core.llm_cache import get_llm_cache
 load_dotenv()
 
-def get_llm():
+def get_llm(semantic_cache: bool = False):
     """
     Simple LLM factory. By default uses OpenAI via OPENAI_API_KEY.
     Set LLM_PROVIDER env variable if you want to extend to other providers.
+    LLM_TEMPERATURE overrides the provider's default temperature. Responses go through
+    the local response cache (core/llm_cache.py) when the temperature allows it;
+    `semantic_cache` also allows near-duplicate prompts to share answers, so only pass it
+    for prompts that carry no names, times or addresses.
     """
     provider = os.getenv("LLM_PROVIDER", "openai").lower()
+    # Provider SDKs take most of a second each to import, so only the selected one is loaded
     if provider == "openai":
+        from langchain_community.llms import OpenAI
         model_name = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        return OpenAI(temperature=0.2, model_name=model_name)
+        temperature = float(os.getenv("LLM_TEMPERATURE", "0.2"))
+        # streaming=True makes tokens visible to astream_events (SSE endpoints); invoke still returns the full text
+        return OpenAI(temperature=temperature, model_name=model_name, streaming=True, cache=get_llm_cache(temperature, semantic_cache))
     elif provider == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
         model_name = os.getenv("GEMINI_MODEL", "gemini-pro-latest")
         api_key = os.getenv("GOOGLE_API_KEY")
-        return ChatGoogleGenerativeAI(model=model_name, google_api_key=api_key)
+        temperature = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+        return ChatGoogleGenerativeAI(model=model_name, google_api_key=api_key, temperature=temperature,
+                                      cache=get_llm_cache(temperature, semantic_cache))
     else:
         raise ValueError(f"Unsupported LLM_PROVIDER={provider} — add it to core/llm.py")
+
+
+@lru_cache(maxsize=None)
+def get_shared_llm():
+    """
+    The process-wide client from get_llm(), built on first use. Endpoints and features
+    share it instead of each building their own at import time.
+    """
+    return get_llm()
     
     
 '''import os
@@ -0,0 +1,205 @@
+# core/llm_cache.py
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") == "1"
+LLM_CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite3"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+# Sampling above temperature 0 is meant to vary, so those models are only cached on request
+LLM_CACHE_NONZERO_TEMPERATURE = os.getenv("LLM_CACHE_NONZERO_TEMPERATURE", "0") == "1"
+# Optional second tier: reuse the answer of an earlier prompt whose embedding is this similar.
+# It only applies to models built with get_llm_cache(..., semantic=True). The whole rendered
+# prompt is embedded, so two template prompts differing only in a name, time or address
+# score ~0.97 and would swap answers: never opt in chains whose prompts carry such details
+# (email drafts, reminder parsing, doc QA).
+LLM_CACHE_SEMANTIC = os.getenv("LLM_CACHE_SEMANTIC", "0") == "1"
+LLM_CACHE_SEMANTIC_THRESHOLD = float(os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD", "0.99"))
+LLM_CACHE_SEMANTIC_PATH = Path(os.getenv("LLM_CACHE_SEMANTIC_PATH", "data/llm_cache_semantic.sqlite3"))
+LLM_CACHE_SEMANTIC_PROVIDER = os.getenv("LLM_CACHE_SEMANTIC_PROVIDER", "local")
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache(BaseCache):
+    """
+    LangChain cache with an exact tier keyed by (llm_string, prompt) and an optional
+    semantic tier that matches prompts by embedding cosine similarity, restricted to
+    the same model and parameters. Entries expire after `ttl` seconds, and the least
+    recently used are evicted past `max_entries`. Both tiers share one SQLite file.
+    """
+
+    def __init__(self, path: Path = LLM_CACHE_PATH, ttl: int = LLM_CACHE_TTL_SECONDS,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, semantic: bool = False,
+                 threshold: float = LLM_CACHE_SEMANTIC_THRESHOLD):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.semantic = semantic
+        self.threshold = threshold
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._embedding = None
+        self._vectors = {}  # llm_string hash -> (keys, normalised matrix), built lazily
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " llm_hash TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " embedding BLOB,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_llm_hash ON llm_cache(llm_hash)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used)")
+        self._conn.commit()
+
+    def _embed(self, prompt: str) -> np.ndarray:
+        if self._embedding is None:
+            from features.doc_qa.embeddings import get_embedding_model
+            self._embedding = get_embedding_model(LLM_CACHE_SEMANTIC_PROVIDER)
+        vector = np.asarray(self._embedding.embed_query(prompt), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) + 1e-12)
+
+    def _semantic_index(self, llm_hash: str, now: float):
+        if llm_hash not in self._vectors:
+            rows = self._conn.execute(
+                "SELECT key, embedding FROM llm_cache WHERE llm_hash = ? AND embedding IS NOT NULL AND created_at > ?",
+                (llm_hash, now - self.ttl),
+            ).fetchall()
+            keys = [key for key, _ in rows]
+            matrix = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows]) if rows else None
+            self._vectors[llm_hash] = (keys, matrix)
+        return self._vectors[llm_hash]
+
+    def _fetch(self, key: str, now: float) -> Optional[RETURN_VAL_TYPE]:
+        row = self._conn.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            return None
+        self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        with warnings.catch_warnings():
+            # langchain_core.load.loads is flagged beta and warns on every call
+            warnings.simplefilter("ignore")
+            return [loads(g) for g in json.loads(row[0])]
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        now = time.time()
+        llm_hash = _hash(llm_string)
+        with self._lock:
+            result = self._fetch(_hash(llm_hash + prompt), now)
+            if result is not None:
+                self.exact_hits += 1
+                return result
+        if self.semantic:
+            query = self._embed(prompt)
+            with self._lock:
+                keys, matrix = self._semantic_index(llm_hash, now)
+                if matrix is not None:
+                    similarities = matrix @ query
+                    best = int(np.argmax(similarities))
+                    if similarities[best] >= self.threshold:
+                        result = self._fetch(keys[best], now)
+                        if result is not None:
+                            self.semantic_hits += 1
+                            return result
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        now = time.time()
+        llm_hash = _hash(llm_string)
+        key = _hash(llm_hash + prompt)
+        vector = self._embed(prompt) if self.semantic else None
+        response = json.dumps([dumps(g) for g in return_val])
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, llm_hash, response, embedding, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, llm_hash, response, vector.tobytes() if vector is not None else None, now, now),
+            )
+            self._conn.commit()
+            self._evict(now)
+            if vector is not None and llm_hash in self._vectors:
+                keys, matrix = self._vectors[llm_hash]
+                self._vectors[llm_hash] = (keys + [key], vector[None, :] if matrix is None else np.vstack([matrix, vector]))
+
+    def _evict(self, now: float) -> None:
+        removed = self._conn.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl,)).rowcount
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            removed += self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            ).rowcount
+        if removed:
+            self._conn.commit()
+            self._vectors.clear()
+
+    def clear(self, **kwargs) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._vectors.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            return {
+                "path": str(self.path),
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "semantic": self.semantic,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+            }
+
+
+_caches = {}
+_cache_lock = threading.Lock()
+
+
+def get_response_cache(semantic: bool = False) -> LLMResponseCache:
+    """
+    The exact-match cache, or with `semantic` (and LLM_CACHE_SEMANTIC=1) the separate
+    cache that also matches similar prompts.
+    """
+    semantic = semantic and LLM_CACHE_SEMANTIC
+    with _cache_lock:
+        if semantic not in _caches:
+            _caches[semantic] = LLMResponseCache(path=LLM_CACHE_SEMANTIC_PATH, semantic=True) if semantic \
+                else LLMResponseCache(path=LLM_CACHE_PATH)
+    return _caches[semantic]
+
+
+def get_llm_cache(temperature: float, semantic: bool = False) -> Union[LLMResponseCache, bool]:
+    """
+    Cache to pass as `cache=` when building a model. Returns False (no caching)
+    when LLM_CACHE=0, or when temperature is above zero and
+    LLM_CACHE_NONZERO_TEMPERATURE is not set. `semantic` opts the model into the
+    similarity tier (see LLM_CACHE_SEMANTIC above for which prompts must not).
+    """
+    if not LLM_CACHE_ENABLED or (temperature > 0 and not LLM_CACHE_NONZERO_TEMPERATURE):
+        return False
+    return get_response_cache(semantic)
@@ -0,0 +1,199 @@
+# core/memory.py
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+from langchain.memory import ConversationSummaryBufferMemory
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+SESSIONS_DIR = Path(os.getenv("MEMORY_SESSIONS_DIR", "data/sessions"))
+# Recent turns are kept verbatim up to this many (estimated) tokens; older ones are folded into the summary
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "1000"))
+MEMORY_IDLE_SECONDS = int(os.getenv("MEMORY_IDLE_SECONDS", "1800"))
+MEMORY_MAX_SESSIONS = int(os.getenv("MEMORY_MAX_SESSIONS", "1000"))
+# Session files on disk: removed once untouched this long, and the least recently written
+# ones past the cap are evicted, so arbitrary new session_ids can't grow the directory without limit
+MEMORY_SESSION_FILE_TTL_SECONDS = int(os.getenv("MEMORY_SESSION_FILE_TTL_SECONDS", str(30 * 24 * 3600)))
+MEMORY_MAX_SESSION_FILES = int(os.getenv("MEMORY_MAX_SESSION_FILES", "10000"))
+# How often get() sweeps the directory for expired files
+_FILE_SWEEP_SECONDS = 3600
+
+_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def _estimate_tokens(messages: List[BaseMessage]) -> int:
+    # ~4 characters per token; the budget only needs to be roughly right, and this
+    # avoids a tokenizer download (OpenAI) or an API round trip (Gemini) per turn
+    return sum(len(m.content) if isinstance(m.content, str) else 0 for m in messages) // 4
+
+
+class SessionMemory(ConversationSummaryBufferMemory):
+    """
+    Sliding window of recent messages plus a rolling summary of everything older,
+    persisted to `path` after every turn as {"summary": ..., "messages": [[role, text], ...]}.
+    """
+
+    path: Optional[Path] = None
+
+    def _split_for_budget(self) -> List[BaseMessage]:
+        buffer = self.chat_memory.messages
+        pruned = []
+        while buffer and _estimate_tokens(buffer) > self.max_token_limit:
+            pruned.append(buffer.pop(0))
+        return pruned
+
+    def prune(self) -> None:
+        pruned = self._split_for_budget()
+        if pruned:
+            self.moving_summary_buffer = self.predict_new_summary(pruned, self.moving_summary_buffer)
+
+    async def aprune(self) -> None:
+        pruned = self._split_for_budget()
+        if pruned:
+            self.moving_summary_buffer = await self.apredict_new_summary(pruned, self.moving_summary_buffer)
+
+    def save_context(self, inputs, outputs) -> None:
+        super().save_context(inputs, outputs)
+        self.persist()
+
+    async def asave_context(self, inputs, outputs) -> None:
+        await super().asave_context(inputs, outputs)
+        self.persist()
+
+    def clear(self) -> None:
+        super().clear()
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+    def persist(self) -> None:
+        if self.path is None:
+            return
+        messages = [["human" if isinstance(m, HumanMessage) else "ai", m.content] for m in self.chat_memory.messages]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"summary": self.moving_summary_buffer, "messages": messages}, separators=(",", ":")))
+        os.replace(tmp, self.path)
+
+    def restore(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        data = json.loads(self.path.read_text())
+        self.moving_summary_buffer = data.get("summary", "")
+        self.chat_memory.messages = [HumanMessage(content=text) if role == "human" else AIMessage(content=text)
+                                     for role, text in data.get("messages", [])]
+
+
+class SessionMemoryStore:
+    """
+    One SessionMemory per session_id. Sessions idle for MEMORY_IDLE_SECONDS, or the least
+    recently used ones past MEMORY_MAX_SESSIONS, are dropped from memory; their state is
+    already on disk and is reloaded on the session's next request.
+    Files on disk are kept until MEMORY_SESSION_FILE_TTL_SECONDS after their last write,
+    and trimmed oldest first to 90% of MEMORY_MAX_SESSION_FILES when the cap is passed;
+    sessions held in memory are never trimmed.
+    """
+
+    def __init__(self, llm, token_budget: int = MEMORY_TOKEN_BUDGET, idle_seconds: int = MEMORY_IDLE_SECONDS,
+                 max_sessions: int = MEMORY_MAX_SESSIONS, base_dir: Path = SESSIONS_DIR,
+                 file_ttl_seconds: int = MEMORY_SESSION_FILE_TTL_SECONDS, max_files: int = MEMORY_MAX_SESSION_FILES):
+        self.llm = llm
+        self.token_budget = token_budget
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self.base_dir = Path(base_dir)
+        self.file_ttl_seconds = file_ttl_seconds
+        self.max_files = max_files
+        self._sessions = OrderedDict()  # session_id -> (memory, last_used)
+        self._file_count = None  # from one directory scan, then counted up as new sessions appear
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> SessionMemory:
+        if not _SESSION_ID_RE.match(session_id):
+            raise ValueError("session_id must be 1-64 characters of letters, digits, '-' or '_'")
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                path = self.base_dir / f"{session_id}.json"
+                if self._file_count is None or now >= self._next_sweep:
+                    self._prune_files(now, keep=session_id)
+                elif not path.exists():
+                    self._file_count += 1
+                    if self._file_count > self.max_files:
+                        self._prune_files(now, keep=session_id)
+                memory = SessionMemory(llm=self.llm, max_token_limit=self.token_budget, memory_key="chat_history",
+                                       input_key="input", output_key="output", path=path)
+                memory.restore()
+            else:
+                memory = entry[0]
+            self._sessions[session_id] = (memory, now)
+            self._sessions.move_to_end(session_id)
+            return memory
+
+    def _evict(self, now: float) -> None:
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used <= self.idle_seconds and len(self._sessions) < self.max_sessions:
+                break
+            self._sessions.pop(session_id)
+
+    def _prune_files(self, now: float, keep: str) -> None:
+        # Called with _lock held. Files are aged by mtime, which persist() refreshes every turn;
+        # `keep` is the session being loaded, counted whether or not its file exists yet
+        files = []
+        kept = 1
+        for path in self.base_dir.glob("*.json"):
+            if path.stem == keep:
+                continue
+            if path.stem in self._sessions:
+                kept += 1
+                continue
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort()
+        expire_before = time.time() - self.file_ttl_seconds
+        count = len(files) + kept
+        target = self.max_files * 0.9 if count > self.max_files else self.max_files
+        for mtime, path in files:
+            if mtime >= expire_before and count <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            count -= 1
+        self._file_count = count
+        self._next_sweep = now + _FILE_SWEEP_SECONDS
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "active_sessions": len(self._sessions),
+                "session_files": self._file_count,
+                "max_session_files": self.max_files,
+                "session_file_ttl_seconds": self.file_ttl_seconds,
+                "max_sessions": self.max_sessions,
+                "idle_seconds": self.idle_seconds,
+                "token_budget": self.token_budget,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_memory_store(llm) -> SessionMemoryStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionMemoryStore(llm)
+    return _store
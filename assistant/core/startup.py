@@ -0,0 +1,64 @@
+# core/startup.py
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+# Taken when main.py imports this module first, so "main import" covers nearly the whole import
+PROCESS_T0 = time.perf_counter()
+
+_timings: Dict[str, float] = {}
+_warmup = {"state": "not started", "errors": {}}
+_lock = threading.Lock()
+
+
+def record(name: str, seconds: float) -> None:
+    with _lock:
+        _timings[name] = round(seconds * 1000, 1)
+
+
+@contextmanager
+def timed(name: str):
+    """
+    Time a block and add it to the startup report, in milliseconds.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def warm_in_background(steps: Dict[str, Callable[[], object]]) -> threading.Thread:
+    """
+    Run `steps` (name -> zero-argument builder) one after another on a daemon thread, so
+    the server accepts traffic first and a request that needs a component before it is
+    warm just builds it itself. Failures are reported, not raised.
+    """
+    def run():
+        with _lock:
+            _warmup["state"] = "running"
+        for name, step in steps.items():
+            try:
+                with timed(f"warm: {name}"):
+                    step()
+            except Exception as e:
+                print(f"Warm-up step {name} failed: {e}")
+                with _lock:
+                    _warmup["errors"][name] = str(e)
+        with _lock:
+            _warmup["state"] = "done"
+        record("ready (since process start)", time.perf_counter() - PROCESS_T0)
+
+    thread = threading.Thread(target=run, name="startup-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def startup_report() -> dict:
+    with _lock:
+        return {
+            "timings_ms": dict(_timings),
+            "warmup": {"state": _warmup["state"], "errors": dict(_warmup["errors"])},
+            "uptime_seconds": round(time.perf_counter() - PROCESS_T0, 1),
+        }
@@ -0,0 +1,67 @@
+# core/streaming.py
+import json
+from typing import Any, AsyncIterator, Callable, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop nginx-style proxies from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """
+    One Server-Sent Event frame. `data` is JSON-encoded so tokens with newlines survive.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def _chunk_text(chunk) -> str:
+    # Chat models stream message chunks (.content), completion LLMs generation chunks (.text)
+    if chunk is None:
+        return ""
+    if hasattr(chunk, "content"):
+        return chunk.content if isinstance(chunk.content, str) else ""
+    return getattr(chunk, "text", chunk) or ""
+
+
+async def stream_runnable(runnable, inputs, request: Request,
+                          final: Callable[[Any], Any], config: Optional[dict] = None) -> AsyncIterator[str]:
+    """
+    Run `runnable` with astream_events and yield SSE frames as things happen:
+    - token: a piece of model output (agents also stream their Thought/Action text)
+    - tool_start / tool_end: an agent step, with the tool input and observation
+    - final: `final(output)` of the top-level run
+    - error: the exception message, after which the stream ends
+
+    The generator is pulled by StreamingResponse one frame at a time, so a slow client slows
+    generation instead of queueing it in memory. When the client disconnects, the event
+    stream is closed, which cancels the underlying LLM calls.
+    """
+    events = runnable.astream_events(inputs, config=config, version="v2")
+    try:
+        async for event in events:
+            if await request.is_disconnected():
+                break
+            kind = event["event"]
+            if kind in ("on_chat_model_stream", "on_llm_stream"):
+                text = _chunk_text(event["data"].get("chunk"))
+                if text:
+                    yield sse_event("token", {"text": text})
+            elif kind == "on_tool_start":
+                yield sse_event("tool_start", {"tool": event["name"], "input": event["data"].get("input")})
+            elif kind == "on_tool_end":
+                yield sse_event("tool_end", {"tool": event["name"], "output": event["data"].get("output")})
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                yield sse_event("final", final(event["data"].get("output")))
+    except Exception as exc:
+        yield sse_event("error", {"detail": str(exc)})
+    finally:
+        await events.aclose()
@@ -1,15 +1,15 @@
 # core/tools.py
 from langchain.tools import Tool
-from features.web_search.search_tool import web_search
-from features.web_search.summariser import summarize_results
-from features.doc_qa.retriever import get_retriever_from_persist_dir, build_retrieval_qa_chain
+from features.web_search.search_tool import web_search, aweb_search
+from features.web_search.summariser import summarize_results, asummarize_results
+from features.doc_qa.pool import get_qa_chain_pool
 from features.email_drafter.email_generator import generate_email_draft
 from features.reminder.reminder_manager import add_reminder_logic, list_reminders_logic
 
 def get_web_search_tool(llm, num_results: int = 5):
     """
     Returns a LangChain Tool which takes a query string and returns a
-    summarized answer plus top links.
+    summarized answer plus top links. Has both sync and async (ainvoke/arun) paths.
     """
 
     def run_search(query: str):
@@ -18,21 +18,32 @@ def get_web_search_tool(llm, num_results: int = 5):
         sources = "\n".join([f"{i+1}. {r['title']} - {r['link']}" for i, r in enumerate(results)])
         return f"Summary:\n{summary}\n\nTop sources:\n{sources}"
 
+    async def arun_search(query: str):
+        results = await aweb_search(query, num_results=num_results)
+        summary = await asummarize_results(llm, results)
+        sources = "\n".join([f"{i+1}. {r['title']} - {r['link']}" for i, r in enumerate(results)])
+        return f"Summary:\n{summary}\n\nTop sources:\n{sources}"
+
     return Tool(
         name="web_search",
         func=run_search,
+        coroutine=arun_search,
         description="Use this to search the web and return a concise summary with top links. Input: a plain-text search query."
     )
     
-def get_document_qa_tool(llm, persist_dir_name: str):
+def get_document_qa_tool(llm, store_ids=None):
     """
-    Returns a Tool that answers queries using the vectorstore at `persist_dir_name`.
-    Use this when you already uploaded a document and built the vectorstore.
+    Returns a Tool that answers queries from uploaded documents.
+    `store_ids` is one store_id, a list of them, or None to search every uploaded document;
+    either way the lookup is a single vector search over the shared index.
+    The QA chain comes from a process-wide pool, so repeat calls skip setup.
+    Building the tool may open a store; the async path (arun) then answers without blocking.
     """
 
-    retriever = get_retriever_from_persist_dir(persist_dir_name)
-
-    qa_chain = build_retrieval_qa_chain(llm, retriever)
+    qa_chain = get_qa_chain_pool().get(llm, store_ids)
+    if isinstance(store_ids, str):
+        store_ids = [store_ids]
+    scope = ", ".join(store_ids) if store_ids else "all uploaded documents"
 
     def run_doc_qa(query: str) -> str:
         """
@@ -41,10 +52,15 @@ def get_document_qa_tool(llm, persist_dir_name: str):
         result = qa_chain.run(query)
         return str(result)
 
+    async def arun_doc_qa(query: str) -> str:
+        result = await qa_chain.ainvoke({"query": query})
+        return str(result["result"])
+
     return Tool(
-        name=f"doc_qa_{persist_dir_name}",
+        name="doc_qa",
         func=run_doc_qa,
-        description=f"Use to answer questions from uploaded document store `{persist_dir_name}`. Input: question string."
+        coroutine=arun_doc_qa,
+        description=f"Use to answer questions from uploaded documents ({scope}). Input: question string."
     )
     
     
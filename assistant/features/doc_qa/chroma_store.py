@@ -0,0 +1,22 @@
+# features/doc_qa/chroma_store.py
+from typing import List, Optional
+
+# LangChain's Chroma wrapper (langchain_community 0.3.x) can neither add pre-computed vectors
+# (add_texts always re-embeds) nor delete by metadata filter, so these two helpers reach
+# into its private `_collection` (a chromadb 1.x Collection). Keep all such access here.
+
+
+def add_vectors(vectordb, ids: List[str], vectors: List[List[float]], texts: List[str],
+                metadatas: List[Optional[dict]]) -> None:
+    """
+    Write chunks with their already computed embeddings. Chroma rejects empty metadata
+    dicts, so callers must pass None (allowed per item in chromadb 1.x) or a placeholder.
+    """
+    vectordb._collection.add(ids=ids, embeddings=vectors, documents=texts, metadatas=metadatas)
+
+
+def delete_where(vectordb, where: dict) -> None:
+    """
+    Delete every chunk whose metadata matches `where`, e.g. {"store_id": "..."}.
+    """
+    vectordb._collection.delete(where=where)
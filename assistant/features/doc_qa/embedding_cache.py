@@ -0,0 +1,166 @@
+# features/doc_qa/embedding_cache.py
+import os
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+# Lives under assistant/data regardless of the working directory, so every app
+# that embeds documents (assistant, pdf_qa) shares the same cache file.
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / "data" / "embedding_cache.sqlite3"
+EMBEDDING_CACHE_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", str(DEFAULT_CACHE_PATH)))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "500000"))
+
+# SQLite limits the number of bound parameters per statement
+_SQL_BATCH = 500
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed store of embedding vectors keyed by (model name, sha256 of the text).
+    Once more than `max_entries` rows are stored, the least recently used 10% are evicted.
+    """
+
+    def __init__(self, path: Path = EMBEDDING_CACHE_PATH, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " text_hash TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (model, text_hash))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model: str, hashes: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up vectors for `hashes`. Returns a list aligned with `hashes`, None where missing.
+        """
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), _SQL_BATCH):
+                batch = hashes[start:start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, h) for h in found],
+                )
+                self._conn.commit()
+            hit_count = sum(1 for h in hashes if h in found)
+            self.hits += hit_count
+            self.misses += len(hashes) - hit_count
+        return [_unpack(found[h]) if h in found else None for h in hashes]
+
+    def put_many(self, model: str, items: Iterable[Tuple[str, List[float]]]) -> None:
+        now = time.time()
+        rows = [(model, h, _pack(v), now) for h, v in items]
+        with self._lock:
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._size += max(cursor.rowcount, 0)
+            if self._size > self.max_entries:
+                evict = self._size - int(self.max_entries * 0.9)
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (evict,),
+                )
+                self._size -= evict
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "entries": self._size,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+@lru_cache(maxsize=None)
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Process-wide cache instance, so hit/miss counters cover every embedding call.
+    """
+    return EmbeddingCache()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps any LangChain Embeddings object and serves repeated texts from the on-disk cache.
+    Only texts that are missing from the cache are sent to the underlying model.
+    """
+
+    def __init__(self, underlying: Embeddings, model_name: str, cache: Optional[EmbeddingCache] = None):
+        self.underlying = underlying
+        self.model_name = model_name
+        self.cache = cache or get_embedding_cache()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [_text_hash(t) for t in texts]
+        vectors = self.cache.get_many(self.model_name, hashes)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            # Embed each distinct missing text once, even if it appears several times
+            pending = {}
+            for i in missing:
+                pending.setdefault(hashes[i], texts[i])
+            computed = dict(zip(pending.keys(), self.underlying.embed_documents(list(pending.values()))))
+            self.cache.put_many(self.model_name, computed.items())
+            for i in missing:
+                vectors[i] = computed[hashes[i]]
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        # Providers may embed queries differently from documents, so keep them in their own namespace
+        model = f"{self.model_name}:query"
+        text_hash = _text_hash(text)
+        vector = self.cache.get_many(model, [text_hash])[0]
+        if vector is None:
+            vector = self.underlying.embed_query(text)
+            self.cache.put_many(model, [(text_hash, vector)])
+        return vector
@@ -0,0 +1,78 @@
+# features/doc_qa/embeddings.py
+import os
+import re
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from features.doc_qa.embedding_cache import CachedEmbeddings
+
+# "google" (remote, GoogleGenerativeAIEmbeddings) or "local" (CPU-only hashing embedder, no downloads)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "google").lower()
+GOOGLE_EMBEDDING_MODEL = "models/embedding-001"
+LOCAL_EMBEDDING_DIM = int(os.getenv("LOCAL_EMBEDDING_DIM", "1024"))
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Offline embedder built on scikit-learn's HashingVectorizer: word uni/bi-grams and
+    character 3-5 grams hashed into `n_features` dimensions, log-scaled and L2-normalised.
+    Needs no fitting, no model files and no network. A whole batch is encoded with
+    one sparse-matrix pass.
+    """
+
+    def __init__(self, n_features: int = LOCAL_EMBEDDING_DIM):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self.n_features = n_features
+        common = dict(n_features=n_features, alternate_sign=False, norm=None, lowercase=True, dtype=np.float32)
+        self._words = HashingVectorizer(analyzer="word", ngram_range=(1, 2), **common)
+        self._chars = HashingVectorizer(analyzer="char_wb", ngram_range=(3, 5), **common)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        from sklearn.preprocessing import normalize
+        # Word features are rarer than character n-grams, so weight them up
+        matrix = 2.0 * self._words.transform(texts) + self._chars.transform(texts)
+        matrix.data = np.log1p(matrix.data)
+        return normalize(matrix).toarray()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+
+def embedding_model_name(provider: str = None) -> str:
+    provider = (provider or EMBEDDING_PROVIDER).lower()
+    if provider == "google":
+        return GOOGLE_EMBEDDING_MODEL
+    elif provider == "local":
+        return f"local-hashing-{LOCAL_EMBEDDING_DIM}"
+    else:
+        raise ValueError(f"Unsupported EMBEDDING_PROVIDER={provider} — add it to features/doc_qa/embeddings.py")
+
+
+def embedding_model_slug(provider: str = None) -> str:
+    """
+    File- and collection-name-safe form of the model name. Vectors from different
+    models are not comparable, so stores and indexes are namespaced by this.
+    """
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", embedding_model_name(provider)).strip("-")
+
+
+@lru_cache(maxsize=None)
+def get_embedding_model(provider: str = None):
+    """
+    Embedding client shared by ingestion and retrieval, selected by EMBEDDING_PROVIDER.
+    The remote provider is wrapped in the on-disk embedding cache so re-embedding known
+    chunks is free; the local one is cheaper to recompute than to look up.
+    Built once per process and reused.
+    """
+    provider = (provider or EMBEDDING_PROVIDER).lower()
+    model_name = embedding_model_name(provider)
+    if provider == "local":
+        return HashingEmbeddings(LOCAL_EMBEDDING_DIM)
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    embedding = GoogleGenerativeAIEmbeddings(model=model_name, google_api_key=os.getenv("GOOGLE_API_KEY"))
+    return CachedEmbeddings(embedding, model_name=model_name)
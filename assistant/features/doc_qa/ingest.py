@@ -0,0 +1,107 @@
+# features/doc_qa/ingest.py
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional
+from uuid import uuid4
+
+from features.doc_qa.chroma_store import add_vectors
+
+# Tunables for the embedding stage of document ingestion
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "100"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "5"))
+EMBED_BACKOFF_SECONDS = float(os.getenv("EMBED_BACKOFF_SECONDS", "1.0"))
+
+
+def _batches(docs: Iterable, size: int) -> Iterator[list]:
+    it = iter(docs)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _embed_with_retry(embedding, texts: List[str], max_retries: int, backoff: float) -> List[List[float]]:
+    """
+    Embed one batch, retrying with exponential backoff and jitter on provider errors.
+    """
+    attempt = 0
+    while True:
+        try:
+            return embedding.embed_documents(texts)
+        except Exception:
+            attempt += 1
+            if attempt > max_retries:
+                raise
+            time.sleep(backoff * (2 ** (attempt - 1)) + random.uniform(0, backoff))
+
+
+def embed_in_batches(
+    docs: Iterable,
+    embedding,
+    sink: Callable[[list, List[List[float]]], None],
+    batch_size: int = EMBED_BATCH_SIZE,
+    concurrency: int = EMBED_CONCURRENCY,
+    max_retries: int = EMBED_MAX_RETRIES,
+    backoff: float = EMBED_BACKOFF_SECONDS,
+) -> int:
+    """
+    Embed `docs` (Documents, or anything with .page_content) in batches on a bounded thread pool.
+    Each finished batch is handed to `sink(batch_docs, vectors)` right away, on the calling thread,
+    so writes to the store never race each other. At most `concurrency` batches are in flight,
+    which means `docs` can be a lazy generator without being materialised.
+    Returns the number of chunks embedded.
+    """
+    batches = _batches(docs, batch_size)
+    pending = {}
+    total = 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        def submit_next() -> bool:
+            batch = next(batches, None)
+            if batch is None:
+                return False
+            texts = [d.page_content for d in batch]
+            pending[pool.submit(_embed_with_retry, embedding, texts, max_retries, backoff)] = batch
+            return True
+
+        more = True
+        while more and len(pending) < concurrency:
+            more = submit_next()
+
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = pending.pop(future)
+                    sink(batch, future.result())
+                    total += len(batch)
+                    if more:
+                        more = submit_next()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+    return total
+
+
+def chroma_sink(vectordb, placeholder: Optional[dict] = None) -> Callable[[list, List[List[float]]], None]:
+    """
+    Sink that writes pre-computed vectors straight into a LangChain Chroma store,
+    skipping the re-embedding `add_texts` would do. Chunks with empty metadata get
+    `placeholder` (Chroma rejects empty dicts); the rest keep their own. Each chunk
+    is stored under its `Document.id` if set, else under a fresh uuid.
+    """
+    def write(batch: list, vectors: List[List[float]]) -> None:
+        add_vectors(
+            vectordb,
+            ids=[d.id or uuid4().hex for d in batch],
+            vectors=vectors,
+            texts=[d.page_content for d in batch],
+            metadatas=[d.metadata or placeholder for d in batch],
+        )
+    return write
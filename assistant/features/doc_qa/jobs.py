@@ -0,0 +1,149 @@
+# features/doc_qa/jobs.py
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Tuple
+
+from features.doc_qa.pages import iter_pdf_pages
+from features.doc_qa.vectorstore import build_vectorstore_from_pages, register_vectorstore, remove_vectorstore
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+# Upload requests are rejected once this many jobs are queued or running
+INGEST_MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", "16"))
+# Finished jobs stay visible to status polling for this long
+INGEST_JOB_TTL_SECONDS = int(os.getenv("INGEST_JOB_TTL_SECONDS", "3600"))
+
+ACTIVE_STATES = ("queued", "running")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class IngestionQueueFull(Exception):
+    pass
+
+
+class IngestionJob:
+    """
+    State of one document ingestion, readable from any thread while it runs.
+    `status` is one of: queued, running, done, failed, cancelled.
+    """
+
+    def __init__(self, store_id: str, content_hash: str, path: str, filename: str):
+        self.store_id = store_id
+        self.content_hash = content_hash
+        self.path = path
+        self.filename = filename
+        self.status = "queued"
+        self.pages_extracted = 0
+        self.chunks_embedded = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def check_cancelled(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.store_id,
+            "store_id": self.store_id,
+            "filename": self.filename,
+            "status": self.status,
+            "pages_extracted": self.pages_extracted,
+            "chunks_embedded": self.chunks_embedded,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class IngestionQueue:
+    """
+    Runs document ingestion (extract -> split -> embed -> persist) on a small, bounded
+    worker pool so uploads return immediately and cannot starve query handlers.
+    Jobs are keyed by store_id, which is derived from the upload's content hash, so
+    uploading the same file while it is still being ingested returns the running job.
+    """
+
+    def __init__(self, workers: int = INGEST_WORKERS, max_pending: int = INGEST_MAX_PENDING):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, store_id: str, content_hash: str, path: str, filename: str) -> IngestionJob:
+        with self._lock:
+            self._prune()
+            existing = self._jobs.get(store_id)
+            if existing is not None and existing.status in ACTIVE_STATES:
+                return existing
+            active = sum(1 for job in self._jobs.values() if job.status in ACTIVE_STATES)
+            if active >= self.max_pending:
+                raise IngestionQueueFull(f"{active} ingestion jobs already pending, try again later.")
+            job = IngestionJob(store_id, content_hash, path, filename)
+            self._jobs[store_id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[IngestionJob]:
+        job = self.get(job_id)
+        if job is not None and job.status in ACTIVE_STATES:
+            job.cancel()
+        return job
+
+    def _prune(self) -> None:
+        cutoff = time.time() - INGEST_JOB_TTL_SECONDS
+        for job_id in [j for j, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def _track_pages(self, job: IngestionJob, pages: Iterable[Tuple[int, str]]) -> Iterator[Tuple[int, str]]:
+        for page in pages:
+            job.check_cancelled()
+            job.pages_extracted += 1
+            yield page
+
+    def _run(self, job: IngestionJob) -> None:
+        def progress(n: int) -> None:
+            job.chunks_embedded += n
+            job.check_cancelled()
+
+        try:
+            job.check_cancelled()
+            job.status = "running"
+            pages = self._track_pages(job, iter_pdf_pages(job.path))
+            build_vectorstore_from_pages(pages, persist_dir_name=job.store_id, progress=progress)
+            register_vectorstore(job.content_hash, job.store_id, job.filename)
+            job.status = "done"
+        except JobCancelled:
+            self._discard(job)
+            job.status = "cancelled"
+        except Exception as e:
+            self._discard(job)
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _discard(self, job: IngestionJob) -> None:
+        try:
+            remove_vectorstore(job.store_id)
+        except Exception as e:
+            print(f"ingestion: failed to remove partial store {job.store_id}: {e}")
+
+
+@lru_cache(maxsize=None)
+def get_ingestion_queue() -> IngestionQueue:
+    return IngestionQueue()
@@ -0,0 +1,161 @@
+# features/doc_qa/lexical.py
+import json
+import math
+import os
+import re
+from array import array
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain.docstore.document import Document
+
+# Inverted indexes live next to the vector stores, one file per store_id
+LEXICAL_BASE = Path("data/vectorstores/lexical")
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Keeps IDs, numbers and dates such as "AOE3158227", "12.5" or "2025-03-01" as single tokens
+_TOKEN_RE = re.compile(r"\w+(?:[-./]\w+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _index_path(store_id: str) -> Path:
+    return LEXICAL_BASE / f"{store_id}.json"
+
+
+class LexicalIndexBuilder:
+    """
+    Accumulates an inverted index (term -> chunk number, term frequency pairs) for one store
+    while its chunks are being embedded, then streams it to disk. Only chunk ids, lengths
+    and postings are kept; the chunk texts live in Chroma and are fetched for the hits.
+    """
+
+    def __init__(self, store_id: str):
+        self.store_id = store_id
+        self.ids: List[str] = []
+        self.lengths: List[int] = []
+        # Flat [chunk number, tf, chunk number, tf, ...] per term, 4 bytes a value
+        self.postings: Dict[str, array] = defaultdict(lambda: array("I"))
+
+    def add(self, docs: Sequence[Document]) -> None:
+        for doc in docs:
+            position = len(self.ids)
+            terms = Counter(tokenize(doc.page_content))
+            for term, tf in terms.items():
+                self.postings[term].extend((position, tf))
+            self.ids.append(doc.id)
+            self.lengths.append(sum(terms.values()))
+
+    def save(self) -> None:
+        LEXICAL_BASE.mkdir(parents=True, exist_ok=True)
+        path = _index_path(self.store_id)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            f.write('{"ids": %s, "lengths": %s, "postings": {' % (json.dumps(self.ids), json.dumps(self.lengths)))
+            for n, (term, pairs) in enumerate(self.postings.items()):
+                f.write("%s%s: %s" % (", " if n else "", json.dumps(term), json.dumps(pairs.tolist())))
+            f.write("}}")
+        os.replace(tmp, path)
+
+
+@lru_cache(maxsize=256)
+def load_lexical_index(store_id: str) -> dict:
+    """
+    Load a store's inverted index. Raises FileNotFoundError if the store has none.
+    Store ids are content-addressed, so a loaded index never goes stale.
+    """
+    return json.loads(_index_path(store_id).read_text())
+
+
+def remove_lexical_index(store_id: str) -> None:
+    load_lexical_index.cache_clear()
+    _index_path(store_id).unlink(missing_ok=True)
+
+
+def bm25_search(store_ids: Sequence[str], query: str, k: int = 5) -> List[Tuple[str, float]]:
+    """
+    BM25 over the union of the given stores' chunks, with document frequencies
+    pooled across all of them. Stores without a lexical index are skipped.
+    Returns the top `k` (chunk id, score) pairs; see bm25_documents for the chunks themselves.
+    """
+    terms = set(tokenize(query))
+    indexes = []
+    for store_id in store_ids:
+        try:
+            index = load_lexical_index(store_id)
+        except FileNotFoundError:
+            continue
+        # Indexes written before chunk ids were recorded can't be resolved; rebuild by re-uploading
+        if "ids" in index:
+            indexes.append(index)
+    total_chunks = sum(len(index["lengths"]) for index in indexes)
+    if not terms or not total_chunks:
+        return []
+    avg_length = sum(sum(index["lengths"]) for index in indexes) / total_chunks or 1.0
+
+    scores: Dict[Tuple[int, int], float] = defaultdict(float)
+    for term in terms:
+        df = sum(len(index["postings"].get(term, ())) // 2 for index in indexes)
+        if not df:
+            continue
+        idf = math.log(1 + (total_chunks - df + 0.5) / (df + 0.5))
+        for n, index in enumerate(indexes):
+            pairs = index["postings"].get(term, ())
+            for position, tf in zip(pairs[::2], pairs[1::2]):
+                length = index["lengths"][position]
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                scores[(n, position)] += idf * tf * (BM25_K1 + 1) / norm
+
+    best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+    return [(indexes[n]["ids"][position], score) for (n, position), score in best]
+
+
+def bm25_documents(vectordb, hits: Sequence[Tuple[str, float]]) -> List[Document]:
+    """
+    Fetch the chunks for bm25_search hits from the Chroma store in one call, in rank order.
+    Chunks deleted from the store since the index was written are dropped.
+    """
+    if not hits:
+        return []
+    found = vectordb.get(ids=[chunk_id for chunk_id, _ in hits], include=["documents", "metadatas"])
+    chunks = {chunk_id: (text, metadata) for chunk_id, text, metadata
+              in zip(found["ids"], found["documents"], found["metadatas"])}
+    results = []
+    for chunk_id, score in hits:
+        if chunk_id in chunks:
+            text, metadata = chunks[chunk_id]
+            results.append(Document(page_content=text, metadata={**(metadata or {}), "bm25_score": round(score, 4)}))
+    return results
+
+
+def looks_like_keyword_query(query: str) -> bool:
+    """
+    Exact-term lookups: a quoted phrase, or a short query containing an ID or number.
+    These are answered from the lexical index alone, without embedding the query.
+    """
+    stripped = query.strip()
+    if len(stripped) > 2 and stripped[0] == stripped[-1] and stripped[0] in "\"'":
+        return True
+    tokens = tokenize(stripped)
+    return 0 < len(tokens) <= 3 and any(any(c.isdigit() for c in t) for t in tokens)
+
+
+def reciprocal_rank_fusion(result_lists: Sequence[Sequence[Document]], k: int, rrf_k: int = 60) -> List[Document]:
+    """
+    Merge ranked lists: each document scores sum(1 / (rrf_k + rank)) over the lists it appears in.
+    """
+    scores: Dict[tuple, float] = defaultdict(float)
+    docs: Dict[tuple, Document] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results):
+            key = (doc.metadata.get("store_id"), doc.metadata.get("page"), doc.page_content)
+            scores[key] += 1.0 / (rrf_k + rank + 1)
+            docs.setdefault(key, doc)
+    ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [docs[key] for key in ranked]
@@ -1,38 +1,53 @@
 # features/document_qa/loader.py
 import os
+import hashlib
+import tempfile
 from pathlib import Path
-from typing import List
-from uuid import uuid4
+from typing import Tuple
 
-import PyPDF2
+from features.doc_qa.pages import iter_pdf_pages
 
 UPLOAD_DIR = Path("data/uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-def save_upload(file_obj, filename: str) -> str:
+# Uploads are read and hashed in pieces of this size so large PDFs never sit in memory whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def save_upload(file_obj, filename: str) -> Tuple[str, str]:
     """
-    Save an uploaded file-like object to disk and return saved path.
+    Stream an uploaded file-like object to disk while computing its sha256.
     `file_obj` supports .read() (FastAPI UploadFile.file).
+    Files are named `<hash prefix>_<filename>`; if the same bytes were uploaded before,
+    the new copy is discarded and the existing path is returned.
+    Returns (saved_path, content_hash).
     """
-    unique_name = f"{uuid4().hex}_{filename}"
-    saved_path = UPLOAD_DIR / unique_name
-    with open(saved_path, "wb") as f:
-        f.write(file_obj.read())
-    return str(saved_path)
+    hasher = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iter(lambda: file_obj.read(UPLOAD_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                f.write(chunk)
+        content_hash = hasher.hexdigest()
+        prefix = content_hash[:32]
+
+        existing = next(UPLOAD_DIR.glob(f"{prefix}_*"), None)
+        if existing is not None:
+            os.remove(tmp_path)
+            return str(existing), content_hash
+
+        saved_path = UPLOAD_DIR / f"{prefix}_{Path(filename).name}"
+        os.replace(tmp_path, saved_path)
+        return str(saved_path), content_hash
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 def extract_text_from_pdf(path: str) -> str:
     """
     Extracts text from a PDF using PyPDF2.
     Returns a single large string with the PDF content.
+    Prefer `iter_pdf_pages` for large files, which streams pages instead.
     """
-    text_chunks: List[str] = []
-    with open(path, "rb") as fh:
-        reader = PyPDF2.PdfReader(fh)
-        for page in reader.pages:
-            try:
-                text = page.extract_text() or ""
-            except Exception:
-                text = ""
-            if text:
-                text_chunks.append(text)
-    return "\n\n".join(text_chunks)
\ No newline at end of file
+    return "\n\n".join(text for _, text in iter_pdf_pages(path))
\ No newline at end of file
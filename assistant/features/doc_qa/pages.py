@@ -0,0 +1,74 @@
+# features/doc_qa/pages.py
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+import PyPDF2
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.docstore.document import Document
+
+# PDFs with at least this many pages are extracted on a process pool
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "64"))
+PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "16"))
+EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+
+
+def _extract_page(page) -> str:
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        return ""
+
+
+def _extract_range(path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    """
+    Worker: extract pages [start, end) of `path`. Page numbers in the result are 1-based.
+    """
+    with open(path, "rb") as fh:
+        reader = PyPDF2.PdfReader(fh)
+        return [(i + 1, _extract_page(reader.pages[i])) for i in range(start, end)]
+
+
+def iter_pdf_pages(path: str, workers: int = EXTRACT_WORKERS) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_number, text) for every page that has text, in page order.
+    Small PDFs are read page by page in-process. Large ones are cut into page ranges that
+    are extracted on a process pool, with only a couple of ranges per worker in flight,
+    so memory stays flat no matter how many pages the document has.
+    """
+    with open(path, "rb") as fh:
+        reader = PyPDF2.PdfReader(fh)
+        num_pages = len(reader.pages)
+        if num_pages < PARALLEL_PAGE_THRESHOLD or workers <= 1:
+            for i, page in enumerate(reader.pages):
+                text = _extract_page(page)
+                if text:
+                    yield i + 1, text
+            return
+
+    ranges = ((start, min(start + PAGES_PER_TASK, num_pages)) for start in range(0, num_pages, PAGES_PER_TASK))
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        in_flight = deque(pool.submit(_extract_range, path, start, end) for start, end in islice(ranges, workers * 2))
+        while in_flight:
+            extracted = in_flight.popleft().result()
+            next_range = next(ranges, None)
+            if next_range:
+                in_flight.append(pool.submit(_extract_range, path, *next_range))
+            for page_number, text in extracted:
+                if text:
+                    yield page_number, text
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def split_pages(pages: Iterable[Tuple[int, str]], chunk_size: int = 1000, chunk_overlap: int = 200) -> Iterator[Document]:
+    """
+    Split pages into chunks as they arrive. Each chunk keeps its page number in metadata["page"].
+    """
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    for page_number, text in pages:
+        for chunk in splitter.split_text(text):
+            yield Document(page_content=chunk, metadata={"page": page_number})
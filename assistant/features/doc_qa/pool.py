@@ -0,0 +1,126 @@
+# features/doc_qa/pool.py
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Union
+
+from features.doc_qa.retriever import get_retriever_from_persist_dir, get_hybrid_retriever, build_retrieval_qa_chain
+from features.doc_qa.vectorstore import VECTORS_BASE, shared_store_ids
+
+DOC_QA_POOL_MAX_STORES = int(os.getenv("DOC_QA_POOL_MAX_STORES", "16"))
+DOC_QA_POOL_MEMORY_MB = int(os.getenv("DOC_QA_POOL_MEMORY_MB", "512"))
+
+
+def _store_size(store_dir: Path) -> int:
+    """
+    On-disk size of a persisted store, used as a rough estimate of its memory cost once opened.
+    """
+    return sum(f.stat().st_size for f in store_dir.rglob("*") if f.is_file())
+
+
+class QAChainPool:
+    """
+    Process-wide LRU of RetrievalQA chains, keyed by the set of store_ids they search.
+    Chains over the shared index are cheap (the index is opened once); legacy
+    per-document stores are charged with their on-disk size against the memory budget.
+    Least recently used entries are dropped when either the entry count or the
+    budget is exceeded. Concurrent requests for the same cold key wait for a single build.
+    """
+
+    def __init__(self, max_stores: int = DOC_QA_POOL_MAX_STORES, memory_budget_mb: int = DOC_QA_POOL_MEMORY_MB):
+        self.max_stores = max_stores
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (qa_chain, estimated bytes)
+        self._used = 0
+        self._lock = threading.Lock()
+        self._build_locks = {}
+
+    def get(self, llm, store_ids: Optional[Union[str, Sequence[str]]] = None):
+        """
+        Return the QA chain over `store_ids` (one id, a list of ids, or None for every
+        document in the shared index), building it on first use.
+        Raises FileNotFoundError for unknown store ids.
+        """
+        if isinstance(store_ids, str):
+            store_ids = [store_ids]
+        store_ids = sorted(set(store_ids or []))
+        key = ",".join(store_ids) or "*"
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+
+            qa_chain, cost = self._build(llm, store_ids)
+
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = (qa_chain, cost)
+                self._used += cost
+                self._evict()
+                self._build_locks.pop(key, None)
+        return qa_chain
+
+    def _build(self, llm, store_ids: List[str]):
+        if not store_ids:
+            return build_retrieval_qa_chain(llm, get_hybrid_retriever()), 0
+
+        shared = set(shared_store_ids())
+        legacy = [s for s in store_ids if s not in shared]
+        if not legacy:
+            return build_retrieval_qa_chain(llm, get_hybrid_retriever(store_ids)), 0
+
+        for store_id in legacy:
+            if Path(store_id).name != store_id or not (VECTORS_BASE / store_id).is_dir():
+                raise FileNotFoundError(f"No vectorstore found for store_id={store_id}")
+        if len(store_ids) > 1:
+            raise ValueError(f"Legacy per-document stores can only be queried on their own: {', '.join(legacy)}")
+        store_dir = VECTORS_BASE / store_ids[0]
+        return build_retrieval_qa_chain(llm, get_retriever_from_persist_dir(store_ids[0])), _store_size(store_dir)
+
+    def warm(self, llm, store_ids: Iterable[str]) -> None:
+        """
+        Build chains for the given store ids ahead of time. Unknown store ids are skipped.
+        """
+        for store_id in store_ids:
+            try:
+                self.get(llm, store_id)
+            except Exception as e:
+                print(f"doc_qa pool: failed to warm {store_id}: {e}")
+
+    def _evict(self) -> None:
+        # Always keep the most recent entry, even if it alone exceeds the budget
+        while len(self._entries) > 1 and (len(self._entries) > self.max_stores or self._used > self.memory_budget):
+            _, (_, cost) = self._entries.popitem(last=False)
+            self._used -= cost
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "keys": list(self._entries.keys()),
+                "estimated_mb": round(self._used / (1024 * 1024), 2),
+                "memory_budget_mb": round(self.memory_budget / (1024 * 1024), 2),
+                "max_stores": self.max_stores,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+@lru_cache(maxsize=None)
+def get_qa_chain_pool() -> QAChainPool:
+    return QAChainPool()
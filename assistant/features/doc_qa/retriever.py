@@ -1,24 +1,80 @@
 # features/document_qa/retriever.py
-from typing import Optional
+import asyncio
+from typing import List, Optional
 from langchain.chains import RetrievalQA
 from langchain.llms.base import LLM
 from langchain.vectorstores import Chroma
 from langchain.docstore.document import Document
 from langchain.llms import OpenAI  
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from features.doc_qa.embeddings import get_embedding_model
+from features.doc_qa.vectorstore import get_shared_vectorstore, shared_store_ids, LEGACY_EMBEDDING_PROVIDER
+from features.doc_qa.lexical import bm25_search, bm25_documents, looks_like_keyword_query, reciprocal_rank_fusion
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
 import os 
 # fallback if you want to create local llm
 
 def get_retriever_from_persist_dir(persist_dir_name: str, search_k: int = 5):
+    """
+    Retriever over a legacy per-document store, queried with the model it was embedded with.
+    """
     persist_dir = f"data/vectorstores/{persist_dir_name}"
-    embedding = GoogleGenerativeAIEmbeddings(
-        model="models/embedding-001",
-        google_api_key=os.getenv("GOOGLE_API_KEY")
-    )
+    embedding = get_embedding_model(LEGACY_EMBEDDING_PROVIDER)
     vectordb = Chroma(persist_directory=persist_dir, embedding_function=embedding)
     retriever = vectordb.as_retriever(search_kwargs={"k": search_k})
     return retriever
 
+def get_shared_retriever(store_ids: Optional[List[str]] = None, search_k: int = 5):
+    """
+    Retriever over the shared index. With `store_ids` the search is restricted to those
+    documents via a metadata filter; with None it searches every document.
+    Either way it is a single vector search.
+    """
+    search_kwargs = {"k": search_k}
+    if store_ids:
+        search_kwargs["filter"] = {"store_id": store_ids[0]} if len(store_ids) == 1 else {"store_id": {"$in": list(store_ids)}}
+    return get_shared_vectorstore().as_retriever(search_kwargs=search_kwargs)
+
+class HybridRetriever(BaseRetriever):
+    """
+    Fuses BM25 hits from the stores' lexical indexes with dense hits from the shared
+    vector index using reciprocal rank fusion. Exact-term lookups (quoted phrases,
+    short queries with IDs or numbers) that the lexical side can answer are returned
+    straight away, without embedding the query.
+    `store_ids=None` means every document in the shared index, resolved per query.
+    """
+
+    vector_retriever: BaseRetriever
+    store_ids: Optional[List[str]] = None
+    k: int = 5
+
+    def _lexical_hits(self, query: str) -> List[Document]:
+        store_ids = self.store_ids if self.store_ids is not None else shared_store_ids()
+        return bm25_documents(get_shared_vectorstore(), bm25_search(store_ids, query, k=self.k))
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        lexical = self._lexical_hits(query)
+        if lexical and looks_like_keyword_query(query):
+            return lexical
+        dense = self.vector_retriever.invoke(query, config={"callbacks": run_manager.get_child()})
+        return reciprocal_rank_fusion([lexical, dense], k=self.k)
+
+    async def _aget_relevant_documents(self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun) -> List[Document]:
+        # A cold BM25 search loads index files from disk and the hits are then fetched
+        # from Chroma, so the lexical side runs on a worker thread, off the event loop
+        lexical = await asyncio.to_thread(self._lexical_hits, query)
+        if lexical and looks_like_keyword_query(query):
+            return lexical
+        dense = await self.vector_retriever.ainvoke(query, config={"callbacks": run_manager.get_child()})
+        return reciprocal_rank_fusion([lexical, dense], k=self.k)
+
+def get_hybrid_retriever(store_ids: Optional[List[str]] = None, search_k: int = 5):
+    """
+    BM25 + vector retriever over the shared index (see HybridRetriever).
+    """
+    return HybridRetriever(vector_retriever=get_shared_retriever(store_ids, search_k=search_k),
+                           store_ids=list(store_ids) if store_ids else None, k=search_k)
+
 def build_retrieval_qa_chain(llm: LLM, retriever, chain_type: str = "stuff"):
     """
     Build a RetrievalQA chain using the provided LLM and retriever.
@@ -1,20 +1,161 @@
 # features/document_qa/vectorstore.py
 import os
+import json
+import shutil
+import threading
 from pathlib import Path
-from typing import List
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from typing import Callable, Iterable, List, Optional, Tuple
+from uuid import uuid4
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.docstore.document import Document
 from langchain.vectorstores import Chroma
-import os
+from features.doc_qa.embeddings import get_embedding_model, embedding_model_name, embedding_model_slug
+from features.doc_qa.ingest import embed_in_batches, chroma_sink
+from features.doc_qa.chroma_store import delete_where
+from features.doc_qa.pages import split_pages
+from features.doc_qa.lexical import LexicalIndexBuilder, remove_lexical_index
 
-# Directory to persist chroma vectorstores
+# Directory to persist chroma vectorstores (the shared index, plus legacy per-document stores)
 VECTORS_BASE = Path("data/vectorstores")
 VECTORS_BASE.mkdir(parents=True, exist_ok=True)
 
+# All documents uploaded through the assistant share one Chroma collection per embedding model;
+# each chunk carries the store_id of its document in metadata["store_id"]
+SHARED_STORE_DIR = VECTORS_BASE / "shared"
+SHARED_COLLECTION = f"documents-{embedding_model_slug()}"
+
+# Legacy per-document stores predate EMBEDDING_PROVIDER and were all embedded with Google;
+# they must be queried with that model whatever the current provider is
+LEGACY_EMBEDDING_PROVIDER = "google"
+
+# Maps sha256 of an uploaded file -> store_id, so identical uploads reuse one store
+REGISTRY_PATH = VECTORS_BASE / "registry.json"
+_registry_lock = threading.Lock()
+# Parsed registry, keyed by the file's mtime so edits from another process are picked up too;
+# register_vectorstore / remove_vectorstore drop it. Guarded by _registry_lock
+_registry_cache: Optional[Tuple[int, dict]] = None
+
+def _read_registry() -> dict:
+    global _registry_cache
+    try:
+        mtime = REGISTRY_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if _registry_cache is None or _registry_cache[0] != mtime:
+        _registry_cache = (mtime, json.loads(REGISTRY_PATH.read_text()))
+    return _registry_cache[1]
+
+def _invalidate_registry() -> None:
+    global _registry_cache
+    with _registry_lock:
+        _registry_cache = None
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_shared_vectorstore():
+    """
+    The single consolidated Chroma store, opened once per process.
+    Guarded by a lock: chromadb fails if two threads open the same path at once.
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            SHARED_STORE_DIR.mkdir(parents=True, exist_ok=True)
+            _shared_store = Chroma(collection_name=SHARED_COLLECTION, persist_directory=str(SHARED_STORE_DIR),
+                                   embedding_function=get_embedding_model())
+    return _shared_store
+
+def find_vectorstore(content_hash: str) -> Optional[str]:
+    """
+    Return the store_id previously built for a file with this content hash,
+    or None if there is none (or its legacy directory has since been removed).
+    A legacy store embedded with a different model than the current one is also a miss,
+    so the file is re-ingested into the shared index instead of handing back a store
+    the current provider can't query.
+    """
+    with _registry_lock:
+        entry = _read_registry().get(content_hash)
+    if not entry:
+        return None
+    if entry.get("index") == "shared":
+        return entry["store_id"] if entry.get("collection") == SHARED_COLLECTION else None
+    if embedding_model_name(LEGACY_EMBEDDING_PROVIDER) != embedding_model_name():
+        return None
+    if (VECTORS_BASE / entry["store_id"]).exists():
+        return entry["store_id"]
+    return None
+
+def shared_store_ids() -> List[str]:
+    """
+    store_ids of every document held in the shared index for the current embedding model.
+    """
+    with _registry_lock:
+        registry = _read_registry()
+    return [e["store_id"] for e in registry.values() if e.get("index") == "shared" and e.get("collection") == SHARED_COLLECTION]
+
+def register_vectorstore(content_hash: str, store_id: str, filename: str) -> None:
+    """
+    Record that the shared index holds the embeddings for the file with `content_hash` under `store_id`.
+    """
+    global _registry_cache
+    with _registry_lock:
+        registry = dict(_read_registry())
+        registry[content_hash] = {"store_id": store_id, "filename": filename, "index": "shared", "collection": SHARED_COLLECTION}
+        tmp = REGISTRY_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(registry, indent=2))
+        os.replace(tmp, REGISTRY_PATH)
+        _registry_cache = None
+
+def remove_vectorstore(store_id: str) -> None:
+    """
+    Delete a (possibly partially ingested) document's chunks from the shared index,
+    or its directory if it is a legacy per-document store.
+    """
+    delete_where(get_shared_vectorstore(), {"store_id": store_id})
+    remove_lexical_index(store_id)
+    _invalidate_registry()
+    legacy_dir = VECTORS_BASE / store_id
+    if Path(store_id).name == store_id and legacy_dir.is_dir() and legacy_dir != SHARED_STORE_DIR:
+        shutil.rmtree(legacy_dir, ignore_errors=True)
+
+def _build_vectorstore(docs, store_id: str, progress: Optional[Callable[[int], None]] = None):
+    """
+    Embed `docs` (any iterable of Documents) into the shared store, tagged with `store_id`.
+    Chunks are embedded in concurrent batches (see features/doc_qa/ingest.py) and
+    written to the store as each batch completes; the store's lexical (BM25) index
+    is built from the same batches and saved at the end. `progress(n)` is called after
+    each batch of n chunks is written; raising from it aborts the build.
+    Returns (vectordb, number of chunks written).
+    """
+    # Create embeddings (cached on disk, so chunks seen before are not re-embedded)
+    embedding = get_embedding_model()
+    vectordb = get_shared_vectorstore()
+
+    # Chunk ids are fixed here so the Chroma rows and the lexical index agree on them
+    def tagged(docs):
+        for doc in docs:
+            doc.metadata["store_id"] = store_id
+            doc.id = uuid4().hex
+            yield doc
+
+    write = chroma_sink(vectordb, placeholder={"store_id": store_id})
+    lexical = LexicalIndexBuilder(store_id)
+
+    def sink(batch, vectors):
+        write(batch, vectors)
+        lexical.add(batch)
+        if progress is not None:
+            progress(len(batch))
+
+    count = embed_in_batches(tagged(docs), embedding, sink)
+    if count:
+        lexical.save()
+    return vectordb, count
+
 def build_vectorstore_from_text(text: str, persist_dir_name: str, chunk_size: int = 1000, chunk_overlap: int = 200):
     """
-    Splits `text` into chunks and builds/persists a Chroma vectorstore.
+    Splits `text` into chunks and adds them to the shared Chroma store under store_id `persist_dir_name`.
     Returns the Chroma vectorstore object.
     """
     # Split text
@@ -22,18 +163,20 @@ def build_vectorstore_from_text(text: str, persist_dir_name: str, chunk_size: in
     texts = splitter.split_text(text)
 
     docs = [Document(page_content=t) for t in texts]
+    vectordb, _ = _build_vectorstore(docs, persist_dir_name)
+    return vectordb
 
-    # Create embeddings
-    embedding = GoogleGenerativeAIEmbeddings(model="models/embedding-001", google_api_key=os.getenv("GOOGLE_API_KEY"))  # uses GOOGLE_API_KEY from env
-
-    persist_dir = str(VECTORS_BASE / persist_dir_name)
-    persist_dir_path = Path(persist_dir)
-    persist_dir_path.mkdir(parents=True, exist_ok=True)
-
-    vectordb = Chroma.from_documents(
-        documents=docs,
-        embedding=embedding,  # This is correct for LangChain's Chroma wrapper
-        persist_directory=persist_dir
-    )
-    return vectordb 
-
+def build_vectorstore_from_pages(pages: Iterable[Tuple[int, str]], persist_dir_name: str, chunk_size: int = 1000, chunk_overlap: int = 200,
+                                 progress: Optional[Callable[[int], None]] = None):
+    """
+    Streaming variant of `build_vectorstore_from_text`: consumes (page_number, text) pairs
+    (e.g. from `iter_pdf_pages`), splitting and embedding while later pages are still being extracted.
+    Chunks carry their page number and store_id in metadata. Raises ValueError if no text was found.
+    Returns the Chroma vectorstore object.
+    """
+    docs = split_pages(pages, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    vectordb, count = _build_vectorstore(docs, persist_dir_name, progress=progress)
+    if count == 0:
+        remove_vectorstore(persist_dir_name)
+        raise ValueError("No extractable text found in PDF.")
+    return vectordb
@@ -0,0 +1,99 @@
+# features/email_drafter/bulk.py
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Dict, List, Tuple
+
+from features.email_drafter.email_generator import agenerate_email_draft
+from features.email_drafter.schema import DraftRequest
+from features.email_drafter.utils import validate_email_fields
+
+# Drafts generated at once, and the provider's requests-per-minute budget shared by all bulk runs
+EMAIL_BULK_CONCURRENCY = int(os.getenv("EMAIL_BULK_CONCURRENCY", "8"))
+EMAIL_BULK_RPM = int(os.getenv("EMAIL_BULK_RPM", "60"))
+EMAIL_BULK_MAX_ITEMS = int(os.getenv("EMAIL_BULK_MAX_ITEMS", "500"))
+
+
+class RateLimiter:
+    """
+    Async limiter allowing `rpm` acquisitions per minute, evenly spaced so a large batch
+    doesn't burst past the provider's limit in its first second.
+    """
+
+    def __init__(self, rpm: int):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_limiter = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(EMAIL_BULK_RPM)
+    return _limiter
+
+
+def _key(item: DraftRequest) -> Tuple[str, ...]:
+    return (item.to.strip().lower(), item.purpose.strip(), item.context.strip(), item.tone.strip().lower(),
+            item.length.strip().lower())
+
+
+async def draft_many(items: List[DraftRequest], concurrency: int = EMAIL_BULK_CONCURRENCY) -> AsyncIterator[Dict]:
+    """
+    Draft every item and yield {"index", "to", "subject", "body", "raw"} (or {"index", "to",
+    "error"}) as each draft finishes, in completion order. Identical inputs are generated
+    once and yielded for every index that asked for them. At most `concurrency` LLM calls
+    run at once, and calls start no faster than EMAIL_BULK_RPM per minute.
+    """
+    if len(items) > EMAIL_BULK_MAX_ITEMS:
+        raise ValueError(f"At most {EMAIL_BULK_MAX_ITEMS} items per request")
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    invalid = []
+    for i, item in enumerate(items):
+        try:
+            validate_email_fields({"to": item.to, "purpose": item.purpose})
+        except ValueError as e:
+            invalid.append({"index": i, "to": item.to, "error": str(e)})
+            continue
+        groups.setdefault(_key(item), []).append(i)
+    for result in invalid:
+        yield result
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    limiter = get_rate_limiter()
+
+    async def draft(indices: List[int]):
+        item = items[indices[0]]
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                return indices, await agenerate_email_draft(item.to, item.purpose, item.context, item.tone, item.length)
+            except Exception as e:
+                return indices, e
+
+    tasks = [asyncio.ensure_future(draft(indices)) for indices in groups.values()]
+    try:
+        for done in asyncio.as_completed(tasks):
+            indices, result = await done
+            for i in indices:
+                if isinstance(result, Exception):
+                    yield {"index": i, "to": items[i].to, "error": str(result)}
+                else:
+                    yield {"index": i, "to": items[i].to, **result}
+    finally:
+        # The client went away (or the caller stopped early): don't keep spending on drafts
+        for task in tasks:
+            task.cancel()
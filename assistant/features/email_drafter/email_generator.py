@@ -1,25 +1,36 @@
 # features/email_drafter/email_generator.py
 from langchain.chains import LLMChain
-from core.llm import get_llm
-from .prompt_template import EMAIL_PROMPT
+from core.llm import get_shared_llm
+from .prompt_template import EMAIL_PROMPT, EMAIL_VARIANTS_PROMPT
+import json
+import os
 import re
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
-llm = get_llm()
+# Upper bound on tone/length combinations per variants request (they share one completion)
+EMAIL_MAX_VARIANTS = int(os.getenv("EMAIL_MAX_VARIANTS", "6"))
 
-def generate_email_draft(recipient: str, purpose: str, context: str = "", tone: str = "polite", length: str = "medium") -> Dict[str,str]:
+@lru_cache(maxsize=None)
+def build_email_chain() -> LLMChain:
     """
-    Returns a dict with keys: subject, body, raw (raw model output).
+    The drafting chain holds no per-request state, so one instance is shared by every call.
     """
-    chain = LLMChain(llm=llm, prompt=EMAIL_PROMPT)
-    out = chain.run({
+    return LLMChain(llm=get_shared_llm(), prompt=EMAIL_PROMPT)
+
+def email_inputs(recipient: str, purpose: str, context: str = "", tone: str = "polite", length: str = "medium") -> Dict[str,str]:
+    return {
         "recipient": recipient,
         "purpose": purpose,
         "context": context or "",
         "tone": tone,
         "length": length
-    })
+    }
 
+def parse_email_output(out: str) -> Dict[str,str]:
+    """
+    Split raw model output into subject and body. Returns a dict with keys: subject, body, raw.
+    """
     # The prompt requests a specific format. Try to parse subject and body robustly.
     subject = ""
     body = out
@@ -31,4 +42,93 @@ def generate_email_draft(recipient: str, purpose: str, context: str = "", tone:
     if body_match:
         body = body_match.group(1).strip()
 
-    return {"subject": subject, "body": body, "raw": out}
\ No newline at end of file
+    return {"subject": subject, "body": body, "raw": out}
+
+def generate_email_draft(recipient: str, purpose: str, context: str = "", tone: str = "polite", length: str = "medium") -> Dict[str,str]:
+    """
+    Returns a dict with keys: subject, body, raw (raw model output).
+    """
+    chain = build_email_chain()
+    out = chain.run(email_inputs(recipient, purpose, context, tone, length))
+    return parse_email_output(out)
+
+async def agenerate_email_draft(recipient: str, purpose: str, context: str = "", tone: str = "polite", length: str = "medium") -> Dict[str,str]:
+    """
+    Async generate_email_draft: the LLM call is awaited instead of blocking a thread.
+    """
+    out = await build_email_chain().ainvoke(email_inputs(recipient, purpose, context, tone, length))
+    return parse_email_output(out["text"])
+
+@lru_cache(maxsize=None)
+def build_variants_chain() -> LLMChain:
+    return LLMChain(llm=get_shared_llm(), prompt=EMAIL_VARIANTS_PROMPT)
+
+def normalise_variants(variants: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Lower-cased, de-duplicated (tone, length) pairs in request order; ValueError if invalid.
+    """
+    unique = []
+    for tone, length in variants:
+        v = (tone.strip().lower(), length.strip().lower())
+        if not all(v):
+            raise ValueError("Each variant needs a tone and a length.")
+        if v not in unique:
+            unique.append(v)
+    if len(unique) > EMAIL_MAX_VARIANTS:
+        raise ValueError(f"At most {EMAIL_MAX_VARIANTS} variants per request.")
+    return unique
+
+def variants_inputs(recipient: str, purpose: str, context: str, variants: List[Tuple[str, str]]) -> Dict[str,str]:
+    return {
+        "recipient": recipient,
+        "purpose": purpose,
+        "context": context or "",
+        "variants": "\n".join(f"{n}. tone: {tone}, length: {length}" for n, (tone, length) in enumerate(variants, 1)),
+        "count": str(len(variants)),
+    }
+
+def parse_variants_output(out: str, variants: List[Tuple[str, str]]) -> List[Dict[str,str]]:
+    """
+    Parse the JSON reply to EMAIL_VARIANTS_PROMPT into [{tone, length, subject, body}], one
+    per requested variant in request order. Unlike parse_email_output this never guesses:
+    anything but a JSON object with exactly the requested variants, each with a non-empty
+    subject and body, raises ValueError.
+    """
+    text = out.strip()
+    # Tolerate a markdown fence around the JSON, nothing else
+    fence = re.fullmatch(r"```(?:json)?\s*(.*?)\s*```", text, flags=re.DOTALL)
+    if fence:
+        text = fence.group(1)
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Variant drafts are not valid JSON: {e}")
+    items = data.get("variants") if isinstance(data, dict) else None
+    if not isinstance(items, list) or len(items) != len(variants):
+        raise ValueError(f"Expected {len(variants)} variant drafts, got {len(items) if isinstance(items, list) else 'none'}.")
+
+    drafts = []
+    for (tone, length), item in zip(variants, items):
+        if not isinstance(item, dict):
+            raise ValueError("Each variant draft must be a JSON object.")
+        subject, body = item.get("subject"), item.get("body")
+        if not isinstance(subject, str) or not subject.strip() or not isinstance(body, str) or not body.strip():
+            raise ValueError(f"Variant {tone}/{length} is missing a subject or body.")
+        if (str(item.get("tone", "")).strip().lower(), str(item.get("length", "")).strip().lower()) != (tone, length):
+            raise ValueError(f"Variant drafts are out of order: expected {tone}/{length}.")
+        drafts.append({"tone": tone, "length": length, "subject": subject.strip(), "body": body.strip()})
+    return drafts
+
+def generate_email_variants(recipient: str, purpose: str, context: str, variants: List[Tuple[str, str]]) -> List[Dict[str,str]]:
+    """
+    Draft the same email in several (tone, length) combinations with a single LLM call.
+    Duplicate combinations are drafted once. Returns [{tone, length, subject, body}].
+    """
+    variants = normalise_variants(variants)
+    out = build_variants_chain().invoke(variants_inputs(recipient, purpose, context, variants))
+    return parse_variants_output(out["text"], variants)
+
+async def agenerate_email_variants(recipient: str, purpose: str, context: str, variants: List[Tuple[str, str]]) -> List[Dict[str,str]]:
+    variants = normalise_variants(variants)
+    out = await build_variants_chain().ainvoke(variants_inputs(recipient, purpose, context, variants))
+    return parse_variants_output(out["text"], variants)
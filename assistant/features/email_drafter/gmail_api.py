@@ -1,14 +1,11 @@
 # features/email_drafter/gmail_api.py
 import os
 import json
-import base64
 from pathlib import Path
 from typing import Optional
 
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 
 TOKEN_PATH = Path("data/google_token.json")
 TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -75,9 +72,13 @@ def fetch_and_store_token(authorization_response_url: str, redirect_uri: str) ->
         "token_uri": creds.token_uri,
         "client_id": creds.client_id,
         "client_secret": creds.client_secret,
-        "scopes": creds.scopes
+        "scopes": creds.scopes,
+        "expiry": creds.expiry.isoformat() if creds.expiry else None
     }
     TOKEN_PATH.write_text(json.dumps(token_data))
+    # The shared client may hold credentials from an earlier consent
+    from features.email_drafter.gmail_client import get_gmail_client
+    get_gmail_client().reset()
     return token_data
 
 def load_credentials() -> Optional[Credentials]:
@@ -98,20 +99,7 @@ def send_message_raw(to_email: str, subject: str, body_text: str) -> dict:
     """
     Send an email using saved credentials.
     Returns the Gmail API response (message resource) on success.
+    Goes through the shared client (gmail_client.py), so the service and token are reused.
     """
-    creds = load_credentials()
-    if not creds:
-        raise RuntimeError("No stored Google credentials. Complete OAuth flow first.")
-    try:
-        service = build("gmail", "v1", credentials=creds)
-        from email.mime.text import MIMEText
-        message = MIMEText(body_text)
-        message["to"] = to_email
-        message["subject"] = subject
-        # 'me' refers to the authenticated user
-        raw_str = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        send_req = {"raw": raw_str}
-        result = service.users().messages().send(userId="me", body=send_req).execute()
-        return result
-    except HttpError as e:
-        raise RuntimeError(f"Gmail API error: {e}")
\ No newline at end of file
+    from features.email_drafter.gmail_client import get_gmail_client
+    return get_gmail_client().send(to_email, subject, body_text)
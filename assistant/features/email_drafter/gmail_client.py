@@ -0,0 +1,219 @@
+# features/email_drafter/gmail_client.py
+import base64
+import json
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from features.email_drafter.gmail_api import TOKEN_PATH
+
+# Point at a local stand-in (e.g. http://127.0.0.1:8085/) to test without Google
+GMAIL_API_ENDPOINT = os.getenv("GMAIL_API_ENDPOINT")
+# Tokens are refreshed this long before they expire, so a send never races the expiry
+GMAIL_REFRESH_MARGIN_SECONDS = int(os.getenv("GMAIL_REFRESH_MARGIN_SECONDS", "300"))
+# Gmail accepts up to 100 calls per batch but recommends at most 50
+GMAIL_BATCH_SIZE = int(os.getenv("GMAIL_BATCH_SIZE", "50"))
+# How long queued emails wait for others to join their batch
+GMAIL_BATCH_WINDOW_SECONDS = float(os.getenv("GMAIL_BATCH_WINDOW_SECONDS", "0.5"))
+GMAIL_HTTP_TIMEOUT_SECONDS = int(os.getenv("GMAIL_HTTP_TIMEOUT_SECONDS", "30"))
+# How long a caller waits for its queued email's batch before treating the send as failed
+GMAIL_SEND_TIMEOUT_SECONDS = float(os.getenv("GMAIL_SEND_TIMEOUT_SECONDS", "60"))
+
+
+def build_raw_message(to_email: str, subject: str, body_text: str) -> Dict[str, str]:
+    message = MIMEText(body_text)
+    message["to"] = to_email
+    message["subject"] = subject
+    return {"raw": base64.urlsafe_b64encode(message.as_bytes()).decode()}
+
+
+class GmailClient:
+    """
+    One Gmail API client per process. The service object (and its discovery document) is
+    built once; credentials are loaded once, refreshed ahead of expiry and written back to
+    `token_path`. httplib2 connections are not thread-safe, so each thread executes
+    requests over its own authorized connection.
+    """
+
+    def __init__(self, token_path: Path = TOKEN_PATH, api_endpoint: Optional[str] = GMAIL_API_ENDPOINT):
+        self.token_path = Path(token_path)
+        self.api_endpoint = api_endpoint
+        self._creds = None
+        self._service = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._outbox: "queue.Queue[Tuple[Dict[str, str], Future]]" = queue.Queue()
+        self._flusher = None
+
+    def reset(self) -> None:
+        """
+        Forget cached credentials and service, e.g. after a new OAuth consent.
+        """
+        with self._lock:
+            self._creds = None
+            self._service = None
+            self._local = threading.local()
+
+    def _load(self):
+        from google.oauth2.credentials import Credentials
+        if not self.token_path.exists():
+            raise RuntimeError("No stored Google credentials. Complete OAuth flow first.")
+        raw = json.loads(self.token_path.read_text())
+        creds = Credentials(
+            token=raw.get("token"),
+            refresh_token=raw.get("refresh_token"),
+            token_uri=raw.get("token_uri"),
+            client_id=raw.get("client_id"),
+            client_secret=raw.get("client_secret"),
+            scopes=raw.get("scopes"),
+        )
+        if raw.get("expiry"):
+            # google-auth keeps expiry as naive UTC
+            creds.expiry = datetime.fromisoformat(raw["expiry"]).replace(tzinfo=None)
+        return creds
+
+    def _save(self, creds) -> None:
+        raw = json.loads(self.token_path.read_text()) if self.token_path.exists() else {}
+        raw.update({"token": creds.token, "expiry": creds.expiry.isoformat() if creds.expiry else None})
+        if creds.refresh_token:
+            raw["refresh_token"] = creds.refresh_token
+        tmp = self.token_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(raw))
+        os.replace(tmp, self.token_path)
+
+    def credentials(self):
+        """
+        Current credentials, refreshed (and persisted) if missing a token or close to expiry.
+        """
+        with self._lock:
+            if self._creds is None:
+                self._creds = self._load()
+            creds = self._creds
+            expiring = creds.expiry is not None and \
+                creds.expiry - datetime.utcnow() < timedelta(seconds=GMAIL_REFRESH_MARGIN_SECONDS)
+            if (not creds.token or expiring) and creds.refresh_token:
+                from google.auth.transport.requests import Request
+                creds.refresh(Request())
+                self._save(creds)
+            return creds
+
+    def service(self):
+        creds = self.credentials()
+        with self._lock:
+            if self._service is None:
+                from googleapiclient.discovery import build
+                client_options = {"api_endpoint": self.api_endpoint} if self.api_endpoint else None
+                # static_discovery uses the discovery document bundled with the library: no network fetch
+                self._service = build("gmail", "v1", credentials=creds, client_options=client_options,
+                                      static_discovery=True, cache_discovery=False)
+            return self._service
+
+    def _http(self):
+        creds = self.credentials()
+        http = getattr(self._local, "http", None)
+        if http is None or http.credentials is not creds:
+            import google_auth_httplib2
+            import httplib2
+            http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=GMAIL_HTTP_TIMEOUT_SECONDS))
+            self._local.http = http
+        return http
+
+    def send(self, to_email: str, subject: str, body_text: str) -> dict:
+        """
+        Send one email. Returns the Gmail message resource.
+        """
+        from googleapiclient.errors import HttpError
+        request = self.service().users().messages().send(userId="me", body=build_raw_message(to_email, subject, body_text))
+        try:
+            return request.execute(http=self._http())
+        except HttpError as e:
+            raise RuntimeError(f"Gmail API error: {e}")
+
+    def send_batch(self, messages: List[Dict[str, str]]) -> List[dict]:
+        """
+        Send many emails ({"to", "subject", "body"} dicts) through Gmail's batch endpoint,
+        GMAIL_BATCH_SIZE per HTTP round trip. Returns one result per message, in order:
+        {"to", "id"} on success or {"to", "error"} on failure.
+        """
+        service = self.service()
+        results: List[dict] = [{} for _ in messages]
+
+        def callback_for(n):
+            def callback(request_id, response, exception):
+                if exception is not None:
+                    results[n] = {"to": messages[n]["to"], "error": str(exception)}
+                else:
+                    results[n] = {"to": messages[n]["to"], "id": response.get("id")}
+            return callback
+
+        for start in range(0, len(messages), GMAIL_BATCH_SIZE):
+            batch = self._new_batch(service)
+            for n in range(start, min(start + GMAIL_BATCH_SIZE, len(messages))):
+                m = messages[n]
+                batch.add(service.users().messages().send(userId="me", body=build_raw_message(m["to"], m["subject"], m["body"])),
+                          callback=callback_for(n))
+            batch.execute(http=self._http())
+        return results
+
+    def _new_batch(self, service):
+        if not self.api_endpoint:
+            return service.new_batch_http_request()
+        # The batch URI comes from the discovery document's rootUrl, which the endpoint override doesn't change
+        from googleapiclient.http import BatchHttpRequest
+        return BatchHttpRequest(batch_uri=self.api_endpoint.rstrip("/") + "/batch")
+
+    def enqueue(self, to_email: str, subject: str, body_text: str) -> Future:
+        """
+        Queue an email to go out with others queued within GMAIL_BATCH_WINDOW_SECONDS,
+        in one batch request. The returned future resolves to the message's {"to", "id"}
+        once sent, or raises RuntimeError if Gmail rejected it or the batch failed.
+        """
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="gmail-batch", daemon=True)
+                self._flusher.start()
+        future = Future()
+        self._outbox.put(({"to": to_email, "subject": subject, "body": body_text}, future))
+        return future
+
+    def _flush_loop(self) -> None:
+        while True:
+            pending = [self._outbox.get()]
+            deadline = datetime.now() + timedelta(seconds=GMAIL_BATCH_WINDOW_SECONDS)
+            while len(pending) < GMAIL_BATCH_SIZE:
+                remaining = (deadline - datetime.now()).total_seconds()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._outbox.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                results = self.send_batch([message for message, _ in pending])
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(RuntimeError(f"Gmail batch send failed: {e}"))
+                continue
+            for (_, future), result in zip(pending, results):
+                if "error" in result:
+                    future.set_exception(RuntimeError(f"Gmail send to {result['to']} failed: {result['error']}"))
+                else:
+                    future.set_result(result)
+            print(f"📧 Gmail batch sent: {len(pending)} message(s)")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_gmail_client() -> GmailClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GmailClient()
+    return _client
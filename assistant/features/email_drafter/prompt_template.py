@@ -15,4 +15,20 @@ EMAIL_PROMPT = PromptTemplate(
         "Body:\n<the message body, include greeting and sign-off>\n\n"
         "END"
     )
-)
\ No newline at end of file
+)
+# One generation for several tone/length combinations; the reply is strict JSON
+EMAIL_VARIANTS_PROMPT = PromptTemplate(
+    input_variables=["recipient", "purpose", "context", "variants", "count"],
+    template=(
+        "You are a helpful assistant that writes professional emails.\n\n"
+        "Recipient: {recipient}\n"
+        "Purpose: {purpose}\n"
+        "Context / additional info: {context}\n\n"
+        "Write {count} complete versions of this email, one for each tone/length below, in this order:\n"
+        "{variants}\n\n"
+        "Length means short (2-4 sentences), medium (1-2 paragraphs) or long (3+ paragraphs). "
+        "Each body includes a greeting and sign-off.\n"
+        "Reply with JSON only, no markdown fences, exactly in this shape:\n"
+        '{{"variants": [{{"tone": "<tone>", "length": "<length>", "subject": "<subject line>", "body": "<email body>"}}]}}\n'
+    )
+)
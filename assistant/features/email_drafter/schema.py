@@ -0,0 +1,28 @@
+# features/email_drafter/schema.py
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class DraftRequest(BaseModel):
+    to: str
+    purpose: str
+    context: str = ""
+    tone: str = "polite"
+    length: str = "medium"
+
+
+class BulkDraftRequest(BaseModel):
+    items: List[DraftRequest] = Field(..., min_length=1)
+
+
+class DraftVariant(BaseModel):
+    tone: str = "polite"
+    length: str = "medium"
+
+
+class VariantDraftRequest(BaseModel):
+    to: str
+    purpose: str
+    context: str = ""
+    variants: List[DraftVariant] = Field(..., min_length=1)
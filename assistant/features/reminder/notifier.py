@@ -0,0 +1,117 @@
+# features/reminder/notifier.py
+import asyncio
+import os
+import threading
+from typing import Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+# Messages buffered per client; a client this far behind is disconnected rather than slowing everyone
+NOTIFY_QUEUE_SIZE = int(os.getenv("NOTIFY_QUEUE_SIZE", "100"))
+NOTIFY_SEND_TIMEOUT_SECONDS = float(os.getenv("NOTIFY_SEND_TIMEOUT_SECONDS", "10"))
+
+
+class _Client:
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=NOTIFY_QUEUE_SIZE)
+        self.sender: Optional[asyncio.Task] = None
+
+
+class NotificationHub:
+    """
+    Fans messages out to the connected /ws clients. `publish` can be called from any
+    thread (e.g. the reminder scheduler): it hands the message to the server's event loop
+    and returns immediately. There each client has a bounded queue drained by its own
+    sender task, so sends run concurrently and a slow or dead client is dropped instead
+    of holding up the rest.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients = set()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped_clients = 0
+
+    async def connect(self, websocket: WebSocket) -> None:
+        """
+        Serve one WebSocket connection until the client goes away.
+        """
+        self._loop = asyncio.get_running_loop()
+        await websocket.accept()
+        client = _Client(websocket)
+        client.sender = asyncio.create_task(self._send_loop(client))
+        self._clients.add(client)
+        try:
+            while True:
+                await websocket.receive_text()
+        except (WebSocketDisconnect, RuntimeError):
+            # RuntimeError: the hub closed this socket after dropping the client
+            pass
+        finally:
+            self._remove(client)
+
+    def publish(self, message: str) -> None:
+        """
+        Thread-safe, non-blocking broadcast. Dropped if no client has ever connected.
+        """
+        with self._lock:
+            self.published += 1
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self.broadcast, message)
+
+    def broadcast(self, message: str) -> None:
+        """
+        Queue `message` for every client. Must run on the event loop.
+        """
+        for client in list(self._clients):
+            try:
+                client.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(client)
+
+    async def _send_loop(self, client: _Client) -> None:
+        try:
+            while True:
+                message = await client.queue.get()
+                await asyncio.wait_for(client.websocket.send_text(message), NOTIFY_SEND_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._drop(client)
+
+    def _remove(self, client: _Client) -> None:
+        self._clients.discard(client)
+        if client.sender is not None and client.sender is not asyncio.current_task():
+            client.sender.cancel()
+
+    def _drop(self, client: _Client) -> None:
+        if client not in self._clients:
+            return
+        self.dropped_clients += 1
+        self._remove(client)
+        asyncio.ensure_future(self._close(client.websocket))
+
+    async def _close(self, websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=1013)  # try again later
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self._clients),
+            "published": self.published,
+            "dropped_clients": self.dropped_clients,
+            "queue_size": NOTIFY_QUEUE_SIZE,
+        }
+
+
+_hub = NotificationHub()
+
+
+def get_notification_hub() -> NotificationHub:
+    return _hub
@@ -3,24 +3,40 @@
 import os
 import json
 from datetime import datetime
-from apscheduler.schedulers.background import BackgroundScheduler
-from fastapi import WebSocket, WebSocketDisconnect, HTTPException
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from email.mime.text import MIMEText
-import base64
-import asyncio
+from fastapi import WebSocket, HTTPException
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
-from langchain_google_genai import ChatGoogleGenerativeAI
-from features.reminder.schema import SessionLocal, Reminder
-
-# Scheduler
-scheduler = BackgroundScheduler()
-scheduler.start()
-
-# LLM Setup
-llm = ChatGoogleGenerativeAI(model="gemini-pro-latest", temperature=0)
+from features.reminder.schema import SessionLocal, Reminder, init_db
+from features.reminder.scheduler import ReminderScheduler
+from features.reminder.time_parser import parse_reminder
+from features.reminder.store import list_reminders
+from features.reminder.notifier import get_notification_hub
+from features.email_drafter.gmail_client import get_gmail_client, GMAIL_SEND_TIMEOUT_SECONDS
+from core.llm_cache import get_llm_cache
+
+# Scheduler and LLM chain are built on first use (or by the startup warm-up), not at import
+_scheduler = None
+_reminder_chain = None
+_lazy_lock = threading.Lock()
+
+def get_scheduler() -> ReminderScheduler:
+    """
+    The process's reminder scheduler. Starting it picks up every pending reminder
+    already in the database, so nothing is lost across restarts.
+    """
+    global _scheduler
+    with _lazy_lock:
+        if _scheduler is None:
+            _scheduler = ReminderScheduler(send_reminder_email, notify=notify_reminder)
+            _scheduler.start()
+    return _scheduler
+
+def stop_scheduler():
+    with _lazy_lock:
+        if _scheduler is not None:
+            _scheduler.stop()
 
 reminder_prompt = PromptTemplate(
     input_variables=["task_text"],
@@ -37,139 +53,101 @@ Current date: {current_date}
 User input: {task_text}
 """
 )
-def add_reminder_logic(text: str):
-    session = SessionLocal()
-    try:
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        parsed = reminder_chain.invoke({
-            "task_text": text,
-            "current_date": current_date
-        })
-    except Exception as e:
-        print(f"Error in add_reminder_logic: {e}")
-reminder_chain = LLMChain(llm=llm, prompt=reminder_prompt)
-
-# WebSocket Clients
-clients = []
 
+def get_reminder_chain() -> LLMChain:
+    global _reminder_chain
+    with _lazy_lock:
+        if _reminder_chain is None:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            llm = ChatGoogleGenerativeAI(model="gemini-pro-latest", temperature=0, cache=get_llm_cache(0))
+            _reminder_chain = LLMChain(llm=llm, prompt=reminder_prompt)
+    return _reminder_chain
 
+# WebSocket clients are served by the notification hub (features/reminder/notifier.py)
 async def reminder_ws(websocket: WebSocket):
-    await websocket.accept()
-    clients.append(websocket)
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        clients.remove(websocket)
+    await get_notification_hub().connect(websocket)
 
 
 async def push_notification(message: str):
     """Send popup notification to all connected clients"""
-    for client in clients:
-        try:
-            await client.send_text(message)
-        except:
-            pass
+    get_notification_hub().broadcast(message)
 
 
 # Gmail Sender
 def send_gmail(task: str):
+    """
+    Send the reminder email through the shared Gmail client (stored token in data/google_token.json).
+    Emails for reminders firing together go out in one batch request; this waits for that
+    batch and raises if the email wasn't sent, so the scheduler records the failure.
+    """
+    to_email = os.getenv("MY_EMAIL")  # configure your email in .env
+    if not to_email:
+        print("Gmail send skipped: MY_EMAIL not set")
+        return
+    future = get_gmail_client().enqueue(to_email, "⏰ Reminder Alert", f"Reminder: {task}")
     try:
-        creds = Credentials.from_authorized_user_file("/Users/utkarshupadhyay/Computer Science/Langchain/assistant/data/google_token.json")
-        service = build("gmail", "v1", credentials=creds)
+        future.result(timeout=GMAIL_SEND_TIMEOUT_SECONDS)
+    except FutureTimeout:
+        raise RuntimeError(f"Gmail send not confirmed within {GMAIL_SEND_TIMEOUT_SECONDS:.0f}s")
 
-        message = MIMEText(f"Reminder: {task}")
-        message["to"] = os.getenv("MY_EMAIL")  # configure your email in .env
-        message["subject"] = "⏰ Reminder Alert"
 
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        service.users().messages().send(userId="me", body={"raw": raw}).execute()
-        print(f"📧 Gmail sent: {task}")
-    except Exception as e:
-        print("Gmail send failed:", e)
+# Reminder Trigger: the scheduler notifies once, then retries the email until it goes out
+def notify_reminder(reminder_id: int, task: str):
+    print(f"⏰ Reminder Triggered! Task: {task} (ID: {reminder_id})")
+    # Handed to the server's event loop, so it isn't held up by Gmail
+    get_notification_hub().publish(f"Reminder: {task}")
 
 
-# Reminder Trigger
-def trigger_reminder(reminder_id: int, task: str):
-    print(f"⏰ Reminder Triggered! Task: {task} (ID: {reminder_id})")
+def send_reminder_email(reminder_id: int, task: str):
+    """
+    Raises if the email fails, so the scheduler retries it instead of marking it delivered.
+    """
     send_gmail(task)
-    asyncio.run(push_notification(f"Reminder: {task}"))
 
-'''
-# Add Reminder Logic
-def add_reminder_logic(text: str):
-    session = SessionLocal()
-    parsed = reminder_chain.run(task_text=text)
-    if parsed.strip().startswith("```"):
-        parsed = parsed.strip().split("```")[1]
-    # Remove optional 'json' after ```
-    if parsed.strip().startswith("json"):
-        parsed = parsed.strip()[4:]
-    parsed = parsed.strip()
 
-    try:
-        data = json.loads(parsed)
-        task = data["task"]
-        remind_at = datetime.strptime(data["datetime"], "%Y-%m-%d %H:%M")
-        if remind_at <= datetime.now():
-            raise HTTPException(status_code=400, detail="Reminder time must be in the future.")
-        
-    except Exception:
-        raise HTTPException(status_code=400, detail=f"Failed to parse reminder: {parsed}")
-
-    db_reminder = Reminder(task=task, remind_at=remind_at)
-    session.add(db_reminder)
-    session.commit()
-    session.refresh(db_reminder)
-
-    scheduler.add_job(
-        trigger_reminder,
-        "date",
-        run_date=remind_at,
-        args=[db_reminder.id, task],
-        id=f"reminder_{db_reminder.id}"
-    )
-
-    return db_reminder '''
-    
-    
+def trigger_reminder(reminder_id: int, task: str):
+    """
+    Deliver a due reminder in one go: popup to connected clients, then email.
+    """
+    notify_reminder(reminder_id, task)
+    send_reminder_email(reminder_id, task)
+
+
 def add_reminder_logic(text: str):
+    init_db()
     session = SessionLocal()
+    parsed = ""
     try:
-        parsed = reminder_chain.invoke({"task_text": text ,"current_date": datetime.now().strftime("%Y-%m-%d")})
-        
-        # If parsed is a dict, extract the text
-        if isinstance(parsed, dict):
-            parsed = parsed.get("text", "")
-        
-        print(f"DEBUG: Raw LLM output: {repr(parsed)}")
+        # Common phrasings are parsed locally; only the rest costs an LLM call
+        fast = parse_reminder(text)
+        if fast is not None:
+            task, remind_at = fast["task"], fast["remind_at"]
+        else:
+            parsed = get_reminder_chain().invoke({"task_text": text ,"current_date": datetime.now().strftime("%Y-%m-%d")})
         
-        # Clean markdown if present
-        if parsed.strip().startswith("```"):
-            lines = parsed.strip().split("```")
-            if len(lines) >= 2:
-                parsed = lines[1]
-                # Remove optional 'json' after ```
-                if parsed.strip().startswith("json"):
-                    parsed = parsed.strip()[4:]
+            # If parsed is a dict, extract the text
+            if isinstance(parsed, dict):
+                parsed = parsed.get("text", "")
         
-        parsed = parsed.strip()
-        print(f"DEBUG: After markdown cleaning: {repr(parsed)}")
+            # Clean markdown if present
+            if parsed.strip().startswith("```"):
+                lines = parsed.strip().split("```")
+                if len(lines) >= 2:
+                    parsed = lines[1]
+                    # Remove optional 'json' after ```
+                    if parsed.strip().startswith("json"):
+                        parsed = parsed.strip()[4:]
         
-        # More comprehensive quote replacement
-        import re
-        parsed = re.sub(r'["""]', '"', parsed)
-        parsed = re.sub(r"[''']", "'", parsed)
+            parsed = parsed.strip()
+            # More comprehensive quote replacement
+            import re
+            parsed = re.sub(r'["""]', '"', parsed)
+            parsed = re.sub(r"[''']", "'", parsed)
         
-        print(f"DEBUG: After quote cleaning: {repr(parsed)}")
-        
-        # Try to parse JSON
-        data = json.loads(parsed)
-        task = data["task"]
-        remind_at = datetime.strptime(data["datetime"], "%Y-%m-%d %H:%M")
-        
-        print(f"DEBUG: Parsed datetime: {remind_at}")
-        print(f"DEBUG: Current time: {datetime.now()}")
+            # Try to parse JSON
+            data = json.loads(parsed)
+            task = data["task"]
+            remind_at = datetime.strptime(data["datetime"], "%Y-%m-%d %H:%M")
         
         # Check if reminder time is in the future
         if remind_at <= datetime.now():
@@ -180,13 +158,7 @@ def add_reminder_logic(text: str):
         session.commit()
         session.refresh(db_reminder)
 
-        scheduler.add_job(
-            trigger_reminder,
-            "date",
-            run_date=remind_at,
-            args=[db_reminder.id, task],
-            id=f"reminder_{db_reminder.id}"
-        )
+        get_scheduler().schedule(db_reminder.id, remind_at)
         
         return db_reminder
         
@@ -194,18 +166,19 @@ def add_reminder_logic(text: str):
         # Re-raise HTTPException without wrapping it
         raise
     except json.JSONDecodeError as e:
-        print(f"DEBUG: JSON decode error: {e}")
-        print(f"DEBUG: Problematic text: {repr(parsed)}")
+        print(f"Reminder LLM output is not valid JSON ({e}): {parsed!r}")
         raise HTTPException(status_code=400, detail=f"Failed to parse reminder JSON: {parsed}")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid datetime format: {e}")
     except Exception as e:
-        print(f"DEBUG: Unexpected error: {e}")
+        print(f"Reminder parse failed: {e}")
         raise HTTPException(status_code=400, detail=f"Failed to parse reminder: {str(e)}")
     finally:
         session.close()
 
 
-def list_reminders_logic():
-    session = SessionLocal()
-    return session.query(Reminder).all()
\ No newline at end of file
+def list_reminders_logic(**filters):
+    """
+    One page of reminders; see features/reminder/store.py for the filters and cursor.
+    """
+    return list_reminders(**filters)[0]
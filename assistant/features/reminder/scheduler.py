@@ -0,0 +1,217 @@
+# features/reminder/scheduler.py
+import heapq
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import and_, case, or_
+
+from features.reminder.schema import SessionLocal, Reminder, init_db
+
+# Only reminders due within this window are held in memory; the rest stay in the table
+REMINDER_HORIZON_SECONDS = int(os.getenv("REMINDER_HORIZON_SECONDS", "3600"))
+# Reminders overdue by more than this when picked up (e.g. the server was down) are marked missed, not sent
+REMINDER_MAX_LATENESS_SECONDS = int(os.getenv("REMINDER_MAX_LATENESS_SECONDS", "86400"))
+REMINDER_DELIVERY_WORKERS = int(os.getenv("REMINDER_DELIVERY_WORKERS", "4"))
+# Failed deliveries are retried up to this many attempts in total, backing off exponentially
+REMINDER_MAX_ATTEMPTS = int(os.getenv("REMINDER_MAX_ATTEMPTS", "5"))
+REMINDER_RETRY_BACKOFF_SECONDS = float(os.getenv("REMINDER_RETRY_BACKOFF_SECONDS", "30"))
+REMINDER_RETRY_MAX_BACKOFF_SECONDS = float(os.getenv("REMINDER_RETRY_MAX_BACKOFF_SECONDS", "1800"))
+# A reminder left in 'sending' longer than this is assumed abandoned by a crashed worker and
+# retried. Must exceed the longest delivery (e.g. GMAIL_SEND_TIMEOUT_SECONDS plus HTTP time),
+# or a slow send still in progress on another worker would be sent twice
+REMINDER_SENDING_LEASE_SECONDS = int(os.getenv("REMINDER_SENDING_LEASE_SECONDS", "300"))
+# Pause before trying again when the refill query itself fails
+REFILL_RETRY_SECONDS = 5
+
+
+class ReminderScheduler:
+    """
+    Fires reminders from the `reminders` table, surviving restarts.
+
+    A heap of (due time, id) holds just the reminders due before `loaded_until`
+    (now + horizon), loaded through the status indexes and refilled as time
+    moves on, so memory and startup cost depend on the horizon, not the table size.
+    Before delivering, a reminder is claimed with an UPDATE guarded by its status, which
+    also stamps `claimed_at`, so it fires once even with several workers running a
+    scheduler on the same database. Only claims older than REMINDER_SENDING_LEASE_SECONDS
+    are taken back (the claiming worker is presumed dead).
+    A failed delivery goes to status 'retry' with `next_attempt_at` backed off
+    exponentially, and becomes 'failed' once REMINDER_MAX_ATTEMPTS attempts are used up.
+    `notify` (e.g. the popup) runs once, on the first attempt; only `deliver` is retried.
+    The refill query runs without holding the scheduler's lock, so schedule() callers
+    never wait on the database.
+    """
+
+    def __init__(self, deliver: Callable[[int, str], None], notify: Optional[Callable[[int, str], None]] = None,
+                 horizon_seconds: int = REMINDER_HORIZON_SECONDS,
+                 max_lateness_seconds: int = REMINDER_MAX_LATENESS_SECONDS, workers: int = REMINDER_DELIVERY_WORKERS):
+        self.deliver = deliver
+        self.notify = notify
+        self.horizon = timedelta(seconds=horizon_seconds)
+        self.max_lateness = timedelta(seconds=max_lateness_seconds)
+        self._heap = []
+        self._queued = set()
+        self._loaded_until: Optional[datetime] = None
+        self._refilling_until: Optional[datetime] = None
+        self._next_refill: Optional[datetime] = None
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reminder-delivery")
+
+    def start(self) -> None:
+        init_db()
+        self._recover()
+        self._refill(datetime.now())
+        self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._pool.shutdown(wait=False)
+
+    def schedule(self, reminder_id: int, remind_at: datetime) -> None:
+        """
+        Register a newly stored reminder. Ones beyond the loaded window are picked up by a later refill.
+        """
+        with self._cond:
+            # A refill in progress may have queried the table before this row was committed
+            window = max(filter(None, (self._loaded_until, self._refilling_until)), default=None)
+            if window is not None and remind_at < window and reminder_id not in self._queued:
+                heapq.heappush(self._heap, (remind_at, reminder_id))
+                self._queued.add(reminder_id)
+                self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "in_memory": len(self._heap),
+                "loaded_until": self._loaded_until.isoformat() if self._loaded_until else None,
+                "next_due": self._heap[0][0].isoformat() if self._heap else None,
+            }
+
+    def _recover(self) -> None:
+        # A worker that died mid-delivery leaves rows in 'sending'; retry them once their
+        # lease has run out. Rows claimed before claimed_at existed have no lease.
+        expired = datetime.now() - timedelta(seconds=REMINDER_SENDING_LEASE_SECONDS)
+        session = SessionLocal()
+        try:
+            (session.query(Reminder)
+             .filter(Reminder.status == "sending", or_(Reminder.claimed_at.is_(None), Reminder.claimed_at < expired))
+             .update({"status": "pending", "claimed_at": None}, synchronize_session=False))
+            session.commit()
+        finally:
+            session.close()
+
+    def _refill(self, now: datetime) -> None:
+        until = now + self.horizon
+        with self._cond:
+            self._refilling_until = until
+        try:
+            session = SessionLocal()
+            try:
+                due_at = case((Reminder.status == "retry", Reminder.next_attempt_at), else_=Reminder.remind_at)
+                rows = (session.query(Reminder.id, due_at)
+                        .filter(or_(and_(Reminder.status == "pending", Reminder.remind_at < until),
+                                    and_(Reminder.status == "retry", Reminder.next_attempt_at < until)))
+                        .all())
+            finally:
+                session.close()
+        except Exception:
+            with self._cond:
+                self._refilling_until = None
+                self._next_refill = now + timedelta(seconds=REFILL_RETRY_SECONDS)
+            raise
+        with self._cond:
+            for reminder_id, due in rows:
+                if reminder_id not in self._queued:
+                    heapq.heappush(self._heap, (due, reminder_id))
+                    self._queued.add(reminder_id)
+            self._loaded_until = max(until, self._loaded_until or until)
+            self._refilling_until = None
+            self._next_refill = self._loaded_until - self.horizon / 2
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                refill = datetime.now() >= self._next_refill
+            if refill:
+                try:
+                    self._recover()
+                    self._refill(datetime.now())
+                except Exception as e:
+                    print(f"Reminder refill failed: {e}")
+            with self._cond:
+                if self._stopped:
+                    return
+                now = datetime.now()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    _, reminder_id = heapq.heappop(self._heap)
+                    self._queued.discard(reminder_id)
+                    due.append(reminder_id)
+                if not due:
+                    next_check = self._next_refill
+                    if self._heap:
+                        next_check = min(next_check, self._heap[0][0])
+                    self._cond.wait(timeout=max(0.0, (next_check - now).total_seconds()))
+                    continue
+            for reminder_id in due:
+                self._pool.submit(self._fire, reminder_id)
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(REMINDER_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1), REMINDER_RETRY_MAX_BACKOFF_SECONDS))
+
+    def _fire(self, reminder_id: int) -> None:
+        session = SessionLocal()
+        try:
+            reminder = session.get(Reminder, reminder_id)
+            if reminder is None or reminder.status not in ("pending", "retry"):
+                return
+            status, attempts = reminder.status, reminder.attempts or 0
+            due = reminder.next_attempt_at if status == "retry" else reminder.remind_at
+            claimed_at = datetime.now()
+            late = claimed_at - due > self.max_lateness
+            claimed = (session.query(Reminder)
+                       .filter(Reminder.id == reminder_id, Reminder.status == status, Reminder.attempts == attempts)
+                       .update({"status": "missed" if late else "sending",
+                                "attempts": attempts if late else attempts + 1,
+                                "claimed_at": None if late else claimed_at}))
+            session.commit()
+            if not claimed or late:
+                return
+            attempts += 1
+            if attempts == 1 and self.notify is not None:
+                try:
+                    self.notify(reminder_id, reminder.task)
+                except Exception as e:
+                    print(f"Reminder {reminder_id} notification failed: {e}")
+            update = {"delivered_at": datetime.now()}
+            try:
+                self.deliver(reminder_id, reminder.task)
+                update["status"] = "delivered"
+            except Exception as e:
+                if attempts < REMINDER_MAX_ATTEMPTS:
+                    retry_at = datetime.now() + self._backoff(attempts)
+                    print(f"Reminder {reminder_id} delivery failed (attempt {attempts}), retrying at {retry_at:%H:%M:%S}: {e}")
+                    update = {"status": "retry", "next_attempt_at": retry_at}
+                else:
+                    print(f"Reminder {reminder_id} delivery failed after {attempts} attempts: {e}")
+                    update["status"] = "failed"
+            update["claimed_at"] = None
+            # Guarded by our claim: if the lease ran out and another worker took the row over, leave it be
+            session.query(Reminder).filter(Reminder.id == reminder_id, Reminder.status == "sending",
+                                           Reminder.claimed_at == claimed_at).update(update)
+            session.commit()
+            if update["status"] == "retry":
+                self.schedule(reminder_id, update["next_attempt_at"])
+        finally:
+            session.close()
@@ -1,6 +1,9 @@
-from pydantic import BaseModel
+import threading
+from contextlib import contextmanager
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, DateTime
+from typing import Optional
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, Index, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -9,15 +12,90 @@ engine = create_engine("sqlite:///./reminders.db", connect_args={"check_same_thr
 Base = declarative_base()
 SessionLocal = sessionmaker(bind=engine)
 
+@event.listens_for(engine, "connect")
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets /list readers run while the scheduler and /add write; busy_timeout waits out
+    # the brief write locks instead of failing with "database is locked"
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+@contextmanager
+def session_scope():
+    """
+    A session that commits on success, rolls back on error and is always closed.
+    """
+    session = SessionLocal()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
 class Reminder(Base):
     __tablename__ = "reminders"
 
     id = Column(Integer, primary_key=True, index=True)
     task = Column(String, nullable=False)
-    remind_at = Column(DateTime, nullable=False)
+    remind_at = Column(DateTime, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # pending -> sending -> delivered / retry (-> sending ...) / failed once attempts run out;
+    # "missed" when picked up too late (see scheduler.py)
+    status = Column(String, nullable=False, default="pending", server_default="pending")
+    delivered_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime, nullable=True)
+    # When the current 'sending' claim was taken: the lease other workers respect
+    claimed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Serve the scheduler's "pending and due before X" and "retry due before X" scans
+        Index("ix_reminders_status_remind_at", "status", "remind_at"),
+        Index("ix_reminders_status_next_attempt_at", "status", "next_attempt_at"),
+    )
 
-Base.metadata.create_all(bind=engine)
+_db_ready = False
+_db_lock = threading.Lock()
+
+def init_db():
+    """
+    Create the tables on first use rather than at import time. Safe to call repeatedly.
+    """
+    global _db_ready
+    if _db_ready:
+        return
+    with _db_lock:
+        if not _db_ready:
+            Base.metadata.create_all(bind=engine)
+            _migrate()
+            _db_ready = True
+
+def _migrate():
+    """
+    Bring a reminders table created before the status columns up to date. create_all
+    only creates missing tables, so columns and indexes are added here.
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns("reminders")}
+    with engine.begin() as conn:
+        if "status" not in columns:
+            conn.execute(text("ALTER TABLE reminders ADD COLUMN status VARCHAR NOT NULL DEFAULT 'pending'"))
+            # The old in-memory scheduler lost anything past due across restarts; don't fire it now
+            conn.execute(text("UPDATE reminders SET status = 'missed' WHERE remind_at <= :now"), {"now": datetime.now()})
+        if "delivered_at" not in columns:
+            conn.execute(text("ALTER TABLE reminders ADD COLUMN delivered_at DATETIME"))
+        if "attempts" not in columns:
+            conn.execute(text("ALTER TABLE reminders ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"))
+        if "next_attempt_at" not in columns:
+            conn.execute(text("ALTER TABLE reminders ADD COLUMN next_attempt_at DATETIME"))
+        if "claimed_at" not in columns:
+            conn.execute(text("ALTER TABLE reminders ADD COLUMN claimed_at DATETIME"))
+    for index in Reminder.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
 
 # -------------------------
 # Pydantic Schemas
@@ -26,7 +104,13 @@ class ReminderIn(BaseModel):
     text: str  # natural language input
 
 class ReminderOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     task: str
     remind_at: datetime
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+    status: str = "pending"
+    delivered_at: Optional[datetime] = None
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
\ No newline at end of file
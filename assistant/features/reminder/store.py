@@ -0,0 +1,89 @@
+# features/reminder/store.py
+import asyncio
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import or_
+
+from features.reminder.schema import Reminder, ReminderOut, init_db, session_scope
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(remind_at: datetime, reminder_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{remind_at.isoformat()}|{reminder_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        remind_at, reminder_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(remind_at), int(reminder_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def list_reminders(when: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   status: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                   cursor: Optional[str] = None) -> Tuple[List[ReminderOut], Optional[str]]:
+    """
+    One page of reminders ordered by (remind_at, id), plus the cursor for the next page
+    (None on the last page). `when` is "upcoming" (soonest first) or "past" (most recent
+    first); `start`/`end` bound remind_at (inclusive/exclusive); `status` filters on delivery
+    state. Pages are fetched by keyset on the remind_at index, so page N costs the same as page 1.
+    """
+    if when not in (None, "upcoming", "past"):
+        raise ValueError("when must be 'upcoming' or 'past'")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    descending = when == "past"
+    init_db()
+    # All conditions on remind_at are folded into one lower and one upper bound: SQLite
+    # seeks the index on a single range, so separate "> now" and "> cursor" filters would
+    # make deep pages scan from the first row
+    now = datetime.now()
+    lower, upper = [], []  # (value, inclusive)
+    if when == "upcoming":
+        lower.append((now, False))
+    elif when == "past":
+        upper.append((now, True))
+    if start is not None:
+        lower.append((start, True))
+    if end is not None:
+        upper.append((end, False))
+    if cursor:
+        after_at, after_id = decode_cursor(cursor)
+        (upper if descending else lower).append((after_at, True))
+
+    with session_scope() as session:
+        query = session.query(Reminder)
+        if lower:
+            value, inclusive = max(lower, key=lambda b: (b[0], not b[1]))
+            query = query.filter(Reminder.remind_at >= value if inclusive else Reminder.remind_at > value)
+        if upper:
+            value, inclusive = min(upper, key=lambda b: (b[0], b[1]))
+            query = query.filter(Reminder.remind_at <= value if inclusive else Reminder.remind_at < value)
+        if cursor:
+            # Rows sharing the cursor's remind_at continue by id
+            if descending:
+                query = query.filter(or_(Reminder.remind_at < after_at, Reminder.id < after_id))
+            else:
+                query = query.filter(or_(Reminder.remind_at > after_at, Reminder.id > after_id))
+        if status is not None:
+            query = query.filter(Reminder.status == status)
+        if descending:
+            query = query.order_by(Reminder.remind_at.desc(), Reminder.id.desc())
+        else:
+            query = query.order_by(Reminder.remind_at, Reminder.id)
+        # One extra row tells whether there is a next page without a COUNT
+        rows = query.limit(limit + 1).all()
+        page = [ReminderOut.model_validate(r) for r in rows[:limit]]
+    next_cursor = encode_cursor(page[-1].remind_at, page[-1].id) if len(rows) > limit else None
+    return page, next_cursor
+
+
+async def alist_reminders(**filters) -> Tuple[List[ReminderOut], Optional[str]]:
+    """
+    list_reminders on a worker thread, so the query never blocks the event loop.
+    """
+    return await asyncio.to_thread(list_reminders, **filters)
@@ -0,0 +1,197 @@
+# features/reminder/time_parser.py
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+
+# Time of day used when only a date is given ("remind me tomorrow to ...")
+DEFAULT_HOUR = 9
+
+_NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "fifteen": 15, "twenty": 20, "thirty": 30,
+    "forty five": 45, "forty-five": 45,
+}
+_UNITS = {"min": "minutes", "mins": "minutes", "minute": "minutes", "minutes": "minutes",
+          "h": "hours", "hr": "hours", "hrs": "hours", "hour": "hours", "hours": "hours",
+          "day": "days", "days": "days", "week": "weeks", "weeks": "weeks"}
+_WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_MONTHS = {m: i + 1 for i, m in enumerate(["jan", "feb", "mar", "apr", "may", "jun",
+                                           "jul", "aug", "sep", "oct", "nov", "dec"])}
+_MONTH = r"(?P<month>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+
+_RELATIVE_RE = re.compile(
+    r"\b(?:in|after)\s+(?P<n>\d+|half\s+an|" + "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True)) + r")\s*"
+    r"(?P<unit>" + "|".join(sorted(_UNITS, key=len, reverse=True)) + r")\b", re.I)
+_TIME_RE = re.compile(
+    r"(?:\b(?:at|by|around|@)\s*)?(?:"
+    r"(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>[ap])\.?\s?m\b\.?"
+    r"|(?P<hour24>\d{1,2}):(?P<minute24>\d{2})\b"
+    r"|(?P<word>noon|midnight)\b"
+    r"|\bat\s+(?P<bare>\d{1,2})\b(?!\s*(?::|\d|/|-|" + "|".join(_UNITS) + r"\b))"
+    r")", re.I)
+_PART_OF_DAY_RE = re.compile(r"\b(?:in\s+the\s+|this\s+)?(?P<part>morning|afternoon|evening|tonight)\b", re.I)
+_DAY_RE = re.compile(r"\b(?:(?P<dat>(?:the\s+)?day\s+after\s+tomorrow)|(?P<tomorrow>tomorrow|tmrw|tmr)|(?P<today>today))\b", re.I)
+_WEEKDAY_RE = re.compile(r"\b(?:on\s+)?(?:(?:next|this|coming)\s+)?(?P<weekday>" + "|".join(_WEEKDAYS) + r")\b", re.I)
+_ISO_DATE_RE = re.compile(r"\b(?:on\s+)?(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})\b", re.I)
+_MONTH_DAY_RE = re.compile(
+    r"\b(?:on\s+)?(?:" + _MONTH + r"\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?"
+    r"|(?P<day2>\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?" + _MONTH.replace("month", "month2") + r")"
+    r"(?:,?\s+(?P<year>\d{4}))?\b", re.I)
+
+_PREFIX_RE = re.compile(
+    r"^\s*(?:hey\s*,?\s*)?(?:please\s+|pls\s+)?(?:can\s+you\s+)?"
+    r"(?:remind\s+me|set\s+(?:a\s+|an\s+)?(?:reminder|alarm)|add\s+(?:a\s+)?reminder|reminder|don'?t\s+let\s+me\s+forget)"
+    r"\s*(?:to|that|about|for|of|:|-)?\s+", re.I)
+# Recurrences and times relative to other events or dates are left to the LLM
+_UNSUPPORTED_RE = re.compile(r"\b(?:every|each|daily|weekly|monthly|from|before|after|until|when|whenever|if)\b", re.I)
+# Date/time words still in the task after the recognised phrases are cut out: something
+# this parser doesn't understand ("on 10/20", "the 25th", "next week") that would otherwise
+# be silently dropped from the schedule
+_LEFTOVER_WHEN_RE = re.compile(
+    r"\b\d{1,4}\s*[/.-]\s*\d{1,2}(?:\s*[/.-]\s*\d{2,4})?\b"
+    r"|\b\d{1,2}\s*(?:st|nd|rd|th)\b"
+    r"|\b(?:next|this|coming|following|last)\s+(?:week|weekend|month|year|time)\b"
+    r"|\b(?:weekend|fortnight|midday|noonish|eod|end\s+of\s+(?:the\s+)?(?:day|week|month|year)|o'?clock|tonite|yesterday)\b"
+    r"|\b(?:jan(?:uary)?|feb(?:ruary)?|march|april|june|july|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b"
+    r"|\b(?:" + "|".join(_WEEKDAYS) + r"|today|tomorrow|tmrw|tmr|morning|afternoon|evening|tonight|noon|midnight)\b"
+    r"|\b\d{1,2}(?::\d{2})?\s*[ap]\.?m\b", re.I)
+_EDGE_WORDS_RE = re.compile(r"^(?:to|at|on|by|in|for|about|and|then)\b\s*|\s*\b(?:to|at|on|by|in|for|about|and|please)$", re.I)
+
+
+def _number(value: str) -> float:
+    value = " ".join(value.lower().split())
+    if value.isdigit():
+        return int(value)
+    if value.startswith("half"):
+        return 0.5
+    return _NUMBER_WORDS[value]
+
+
+def _hour_and_minute(match, part_of_day: Optional[str]):
+    if match.group("word"):
+        return (12, 0) if match.group("word").lower() == "noon" else (0, 0)
+    if match.group("hour24") is not None:
+        hour, minute = int(match.group("hour24")), int(match.group("minute24"))
+        # "7:00" could be morning or evening; "07:00", "0:30", "12:00" and "13:00"+ can't
+        if 1 <= hour <= 11 and not match.group("hour24").startswith("0"):
+            if part_of_day is None:
+                return None
+            if part_of_day in ("afternoon", "evening", "tonight"):
+                hour += 12
+    elif match.group("hour") is not None:
+        hour, minute = int(match.group("hour")), int(match.group("minute") or 0)
+        if not 1 <= hour <= 12:
+            return None
+        pm = match.group("ampm").lower() == "p"
+        hour = hour % 12 + (12 if pm else 0)
+    else:
+        # "at 6" is only unambiguous next to a part of the day ("at 6 in the evening")
+        if part_of_day is None:
+            return None
+        hour, minute = int(match.group("bare")), 0
+        if not 1 <= hour <= 12:
+            return None
+        if part_of_day in ("afternoon", "evening", "tonight") and hour < 12:
+            hour += 12
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+
+def _at(date, hm) -> datetime:
+    return datetime.combine(date, datetime.min.time()).replace(hour=hm[0], minute=hm[1])
+
+
+def parse_reminder(text: str, now: Optional[datetime] = None) -> Optional[dict]:
+    """
+    Deterministic parser for common reminder phrasings: absolute times ("at 6 PM", "18:30"),
+    relative offsets ("in 20 minutes"), "today"/"tomorrow", weekdays and calendar dates.
+    Returns {"task": str, "remind_at": datetime}, or None when the text isn't understood
+    confidently, in which case the caller falls back to the LLM.
+    Like the LLM prompt, a date without a year, or a time already passed today, means the
+    next occurrence.
+    """
+    now = now or datetime.now()
+    spans = []
+
+    def take(regex):
+        matches = list(regex.finditer(text))
+        if len(matches) > 1:
+            raise ValueError("ambiguous")
+        if matches:
+            spans.append(matches[0].span())
+            return matches[0]
+        return None
+
+    try:
+        relative = take(_RELATIVE_RE)
+        time_match = take(_TIME_RE)
+        part = take(_PART_OF_DAY_RE)
+        day = take(_DAY_RE)
+        weekday = take(_WEEKDAY_RE)
+        iso = take(_ISO_DATE_RE)
+        month_day = take(_MONTH_DAY_RE)
+    except ValueError:
+        return None
+    part_of_day = part.group("part").lower() if part else None
+
+    dates = [m for m in (day, weekday, iso, month_day) if m]
+    if len(dates) > 1 or (relative and (time_match or dates)):
+        return None
+
+    if relative:
+        amount = _number(relative.group("n"))
+        remind_at = now + timedelta(**{_UNITS[relative.group("unit").lower()]: amount})
+    else:
+        if time_match:
+            hm = _hour_and_minute(time_match, part_of_day)
+            if hm is None:
+                return None
+        elif part_of_day:
+            hm = {"morning": (9, 0), "afternoon": (15, 0), "evening": (18, 0), "tonight": (20, 0)}[part_of_day]
+        elif dates:
+            hm = (DEFAULT_HOUR, 0)
+        else:
+            return None
+
+        if day:
+            offset = 2 if day.group("dat") else 1 if day.group("tomorrow") else 0
+            date = now.date() + timedelta(days=offset)
+        elif weekday:
+            ahead = (_WEEKDAYS.index(weekday.group("weekday").lower()) - now.weekday()) % 7
+            date = now.date() + timedelta(days=ahead)
+            if ahead == 0 and _at(date, hm) <= now:
+                date += timedelta(days=7)
+        elif iso or month_day:
+            m = iso or month_day
+            try:
+                if iso:
+                    month, day_of_month = int(m.group("month")), int(m.group("day"))
+                else:
+                    month = _MONTHS[(m.group("month") or m.group("month2"))[:3].lower()]
+                    day_of_month = int(m.group("day") or m.group("day2"))
+                year = int(m.group("year")) if m.group("year") else now.year
+                date = datetime(year, month, day_of_month).date()
+                if not m.group("year") and _at(date, hm) <= now:
+                    date = date.replace(year=year + 1)
+            except ValueError:
+                return None
+        else:
+            date = now.date()
+            if _at(date, hm) <= now:
+                date += timedelta(days=1)
+        remind_at = _at(date, hm)
+
+    task = text
+    for start, end in sorted(spans, reverse=True):
+        task = task[:start] + " " + task[end:]
+    if _UNSUPPORTED_RE.search(task) or _LEFTOVER_WHEN_RE.search(task):
+        return None
+    task = _PREFIX_RE.sub("", " ".join(task.split()) + " ").strip()
+    previous = None
+    while previous != task:
+        previous = task
+        task = _EDGE_WORDS_RE.sub("", task.strip(" ,.;:-!")).strip()
+    if not task:
+        return None
+    return {"task": task, "remind_at": remind_at.replace(second=0, microsecond=0)}
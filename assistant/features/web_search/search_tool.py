@@ -1,13 +1,132 @@
 # features/web_search/search_tool.py
+import asyncio
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from serpapi import GoogleSearch
 
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "600"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+
+# (normalized query, num_results) -> (expires_at, results)
+_cache = OrderedDict()
+# (normalized query, num_results) -> Future shared by callers waiting on the same search
+_in_flight = {}
+_lock = threading.Lock()
+
+class _Abandoned(Exception):
+    """
+    The leading caller was cancelled (or interrupted) before its search finished; callers
+    waiting on it look the query up again instead of inheriting the cancellation.
+    """
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+def _lookup(key):
+    """
+    Cached results for `key`, or (None, future, leader): the future of an identical search
+    already in flight, or a new one this caller must complete (leader=True).
+    """
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            _cache.move_to_end(key)
+            return entry[1], None, False
+        future = _in_flight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            # A running future can't be cancelled, so a cancelled waiter (asyncio.wrap_future
+            # propagates cancellation) leaves the search and the other waiters alone
+            future.set_running_or_notify_cancel()
+            _in_flight[key] = future
+    return None, future, leader
+
+def _fail(key, future, exc):
+    with _lock:
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+    future.set_exception(exc)
+
+def _abandon(key, future):
+    _fail(key, future, _Abandoned())
+
+def _store(key, future, results):
+    with _lock:
+        _cache[key] = (time.monotonic() + SEARCH_CACHE_TTL_SECONDS, results)
+        _cache.move_to_end(key)
+        while len(_cache) > SEARCH_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+    future.set_result(results)
+
 def web_search(query: str, num_results: int = 5):
     """
     Uses SerpAPI (Google) to fetch top results.
     Requires SERPAPI_API_KEY env var.
     Returns list of dicts: {title, snippet, link}
+    Results are cached per normalized query for SEARCH_CACHE_TTL_SECONDS, and concurrent
+    identical searches share a single SerpAPI call.
     """
+    key = (normalize_query(query), num_results)
+    while True:
+        results, future, leader = _lookup(key)
+        if results is not None:
+            return [dict(r) for r in results]
+        if leader:
+            break
+        try:
+            return [dict(r) for r in future.result()]
+        except _Abandoned:
+            continue
+
+    try:
+        results = _fetch_results(query, num_results)
+    except Exception as e:
+        _fail(key, future, e)
+        raise
+    except BaseException:
+        _abandon(key, future)
+        raise
+    _store(key, future, results)
+    return [dict(r) for r in results]
+
+async def aweb_search(query: str, num_results: int = 5):
+    """
+    Async web_search sharing the same cache and in-flight searches. Cache hits return
+    without leaving the event loop, followers await the leader's future, and only the
+    SerpAPI call itself (a blocking client) runs in a worker thread. A cancelled waiter
+    doesn't affect the others; if the leader is cancelled, a waiter takes over the search.
+    """
+    key = (normalize_query(query), num_results)
+    while True:
+        results, future, leader = _lookup(key)
+        if results is not None:
+            return [dict(r) for r in results]
+        if leader:
+            break
+        try:
+            return [dict(r) for r in await asyncio.wrap_future(future)]
+        except _Abandoned:
+            continue
+
+    try:
+        results = await asyncio.to_thread(_fetch_results, query, num_results)
+    except Exception as e:
+        _fail(key, future, e)
+        raise
+    except BaseException:
+        # Cancelled: drop the in-flight entry so the next caller (or a waiter) retries
+        _abandon(key, future)
+        raise
+    _store(key, future, results)
+    return [dict(r) for r in results]
+
+def _fetch_results(query: str, num_results: int):
     api_key = os.getenv("SERPAPI_API_KEY")
     if not api_key:
         raise EnvironmentError("SERPAPI_API_KEY not set. Get one at https://serpapi.com/")
@@ -1,20 +1,84 @@
 # features/web_search/summarizer.py
-from langchain.chains.summarize import load_summarize_chain
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from langchain.chains.summarize import load_summarize_chain, map_reduce_prompt
 from langchain.docstore.document import Document
 from typing import List, Dict
 
-def summarize_results(llm, results: List[Dict], chain_type: str = "map_reduce"):
+# Results whose combined text fits in this many (estimated) tokens are summarised in one call
+SUMMARY_STUFF_TOKEN_BUDGET = int(os.getenv("SUMMARY_STUFF_TOKEN_BUDGET", "3000"))
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "8"))
+
+def _estimate_tokens(docs: List[Document]) -> int:
+    # ~4 characters per token; avoids a provider round trip just to count tokens
+    return sum(len(d.page_content) for d in docs) // 4
+
+def _result_docs(results: List[Dict]) -> List[Document]:
+    docs = []
+    for r in results:
+        content = f"{r.get('title','')}\n{r.get('snippet','')}\nSource: {r.get('link','')}"
+        docs.append(Document(page_content=content))
+    return docs
+
+def _pick_chain_type(docs: List[Document], chain_type: str) -> str:
+    if chain_type == "auto":
+        return "stuff" if _estimate_tokens(docs) <= SUMMARY_STUFF_TOKEN_BUDGET else "map_reduce"
+    return chain_type
+
+def summarize_results(llm, results: List[Dict], chain_type: str = "auto"):
     """
     Summarize the list of search results (title + snippet) using a LangChain summarization chain.
     `llm` should be a LangChain LLM instance (from core.llm.get_llm()).
+    With chain_type="auto", results that fit SUMMARY_STUFF_TOKEN_BUDGET go through a single
+    "stuff" call; larger ones use map_reduce with the map calls run concurrently.
     Returns a short textual summary.
     """
-    docs = []
-    for r in results:
-        content = f"{r.get('title','')}\n{r.get('snippet','')}\nSource: {r.get('link','')}"
-        docs.append(Document(page_content=content))
+    docs = _result_docs(results)
+    chain_type = _pick_chain_type(docs, chain_type)
+    if chain_type == "map_reduce":
+        return _map_reduce_concurrently(llm, docs)
 
-    # map_reduce is robust for multiple short docs
     chain = load_summarize_chain(llm, chain_type=chain_type)
     summary = chain.run(docs)
-    return summary
\ No newline at end of file
+    return summary
+
+def _map_reduce_concurrently(llm, docs: List[Document]) -> str:
+    """
+    Same prompts as the map_reduce summarize chain, but the per-document map calls
+    are issued together (up to SUMMARY_MAP_CONCURRENCY at once) instead of one by one.
+    """
+    prompts = [map_reduce_prompt.PROMPT.format(text=d.page_content) for d in docs]
+    # llm.batch() on completion-style LLMs still runs prompts one after another, so use our own pool
+    with ThreadPoolExecutor(max_workers=max(1, min(SUMMARY_MAP_CONCURRENCY, len(prompts)))) as pool:
+        outputs = list(pool.map(llm.invoke, prompts))
+    partials = [Document(page_content=getattr(out, "content", out)) for out in outputs]
+    chain = load_summarize_chain(llm, chain_type="stuff")
+    return chain.run(partials)
+
+async def asummarize_results(llm, results: List[Dict], chain_type: str = "auto") -> str:
+    """
+    Async summarize_results: same chain selection, but the LLM calls are awaited
+    on the event loop (ainvoke) instead of blocking a thread.
+    """
+    docs = _result_docs(results)
+    chain_type = _pick_chain_type(docs, chain_type)
+    if chain_type == "map_reduce":
+        return await _amap_reduce_concurrently(llm, docs)
+
+    chain = load_summarize_chain(llm, chain_type=chain_type)
+    output = await chain.ainvoke({"input_documents": docs})
+    return output["output_text"]
+
+async def _amap_reduce_concurrently(llm, docs: List[Document]) -> str:
+    semaphore = asyncio.Semaphore(max(1, SUMMARY_MAP_CONCURRENCY))
+
+    async def map_one(doc: Document):
+        async with semaphore:
+            return await llm.ainvoke(map_reduce_prompt.PROMPT.format(text=doc.page_content))
+
+    outputs = await asyncio.gather(*(map_one(d) for d in docs))
+    partials = [Document(page_content=getattr(out, "content", out)) for out in outputs]
+    chain = load_summarize_chain(llm, chain_type="stuff")
+    output = await chain.ainvoke({"input_documents": partials})
+    return output["output_text"]
@@ -1,98 +1,254 @@
 # main.py
+from core.startup import timed, record, startup_report, warm_in_background, PROCESS_T0
 import os
-from fastapi import FastAPI, HTTPException, Query , UploadFile, File , Request, Form
+import threading
+import time
+from functools import lru_cache
+from fastapi import FastAPI, HTTPException, Query , UploadFile, File , Request, Form, Response, WebSocket
 from fastapi.responses import JSONResponse , RedirectResponse, HTMLResponse
+from starlette.concurrency import run_in_threadpool
 import uvicorn
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from fastapi import APIRouter 
 
-from core.llm import get_llm
+from core.llm import get_shared_llm
+from core.llm_cache import get_response_cache
 from core.tools import get_web_search_tool , get_document_qa_tool
 from core.agent import build_agent
+from core.memory import get_session_memory_store
+from core.streaming import sse_event, sse_response, stream_runnable
 
-from features.doc_qa.loader import save_upload, extract_text_from_pdf
-from features.doc_qa.vectorstore import build_vectorstore_from_text 
+from features.doc_qa.loader import save_upload
+from features.doc_qa.vectorstore import find_vectorstore, shared_store_ids
+from features.doc_qa.jobs import get_ingestion_queue, IngestionQueueFull
+from features.doc_qa.embedding_cache import get_embedding_cache
+from features.doc_qa.pool import get_qa_chain_pool
 
 
-from features.email_drafter.email_generator import generate_email_draft
+from features.email_drafter.email_generator import generate_email_draft, build_email_chain, email_inputs, parse_email_output, agenerate_email_variants, normalise_variants
 from features.email_drafter.gmail_api import create_auth_url, fetch_and_store_token, send_message_raw, load_credentials
 from features.email_drafter.utils import validate_email_fields
+from features.email_drafter.schema import BulkDraftRequest, VariantDraftRequest
+from features.email_drafter.bulk import draft_many, EMAIL_BULK_MAX_ITEMS
 
 
-from features.reminder.schema import ReminderIn, ReminderOut
-from features.reminder.reminder_manager import add_reminder_logic, list_reminders_logic, reminder_ws
+from features.reminder.schema import ReminderIn, ReminderOut, init_db
+from features.reminder.store import alist_reminders, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from features.reminder.notifier import get_notification_hub
+from features.reminder.reminder_manager import add_reminder_logic, reminder_ws, get_scheduler, get_reminder_chain, stop_scheduler
 
 
 app = FastAPI(title="Personal AI Assistant - Minimal Web Search Feature")
 
-# Initialize at startup
-llm = get_llm()
-web_tool = get_web_search_tool(llm, num_results=int(os.getenv("SEARCH_NUM_RESULTS", "5")))
-agent = build_agent(llm, tools=[web_tool], verbose=False)
+# Components are built on first use, or by the warm-up thread once the server is accepting traffic
+get_main_llm = get_shared_llm
+
+@lru_cache(maxsize=None)
+def get_web_tool():
+    return get_web_search_tool(get_main_llm(), num_results=int(os.getenv("SEARCH_NUM_RESULTS", "5")))
+
+@lru_cache(maxsize=None)
+def get_agent():
+    """
+    Stateless agent for requests without a session_id; sessions get their own memory.
+    """
+    return build_agent(get_main_llm(), tools=[get_web_tool()], verbose=False)
+
+def agent_for_session(session_id: Optional[str]):
+    if not session_id:
+        return get_agent()
+    try:
+        memory = get_session_memory_store(get_main_llm()).get(session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return build_agent(get_main_llm(), tools=[get_web_tool()], verbose=False, memory=memory)
+
+record("main import", time.perf_counter() - PROCESS_T0)
+
+@app.on_event("startup")
+def warm_up():
+    """
+    Build the LLM client, agent, reminder database/scheduler/chain in the background, then
+    open the stores listed in DOC_QA_WARM_STORES (comma-separated store_ids), so the
+    first requests skip that setup. Timings are served at /startup_report.
+    """
+    record("server started (since process start)", time.perf_counter() - PROCESS_T0)
+    steps = {
+        "llm": get_main_llm,
+        "agent": get_agent,
+        "reminder db": init_db,
+        # Started eagerly so reminders scheduled in this process fire even if nothing else touches it
+        "reminder scheduler": get_scheduler,
+        "reminder chain": get_reminder_chain,
+    }
+    store_ids = [s.strip() for s in os.getenv("DOC_QA_WARM_STORES", "").split(",") if s.strip()]
+    if store_ids:
+        steps["doc_qa stores"] = lambda: get_qa_chain_pool().warm(get_main_llm(), store_ids)
+    warm_in_background(steps)
+
+@app.on_event("shutdown")
+def stop_reminder_scheduler():
+    stop_scheduler()
+
+@app.get("/startup_report")
+def get_startup_report():
+    """
+    Import, server start and warm-up timings (ms) for this worker.
+    """
+    return startup_report()
 
 @app.get("/search")
-def search(q: str = Query(..., description="Search query")):
+async def search(q: str = Query(..., description="Search query"),
+                 session_id: Optional[str] = Query(None, description="Conversation id; follow-up questions with the same id see earlier turns")):
+    session_agent = agent_for_session(session_id)
     try:
-        response = agent.run(q)
+        result = await session_agent.ainvoke({"input": q})
+        response = result["output"]
         return {"query": q, "answer": response}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
+
+@app.get("/search/stream")
+async def search_stream(request: Request, q: str = Query(..., description="Search query"),
+                        session_id: Optional[str] = Query(None, description="Conversation id, as for /search")):
+    """
+    Server-Sent Events version of /search: streams the agent's steps (tool_start/tool_end),
+    model tokens as they are generated, then a final event with the answer.
+    """
+    return sse_response(stream_runnable(agent_for_session(session_id), {"input": q}, request,
+                                        final=lambda out: {"query": q, "answer": out["output"]}))
     
     
-@app.post("/upload_document")
+@app.post("/upload_document", status_code=202)
 async def upload_document(file: UploadFile = File(...)):
     """
-    Upload a PDF file, extract text, build + persist a vectorstore.
-    Returns a store_id which can be used for future queries.
+    Upload a PDF file and queue it for ingestion (extract text, embed, persist a vectorstore).
+    Returns right away with a store_id, which doubles as the job_id for /jobs/{job_id}.
+    Re-uploading a file with identical bytes returns the existing store_id without re-embedding.
     """
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF uploads are supported at the moment.")
 
-    # Save uploaded file to disk
-    saved_path = save_upload(await file.read(), file.filename) if False else None
-    # The above won't run because save_upload expects a file-like; instead use file.file
+    # Stream uploaded file to disk, hashing it as we go (off the event loop)
     try:
-        saved_path = save_upload(file.file, file.filename)
+        saved_path, content_hash = await run_in_threadpool(save_upload, file.file, file.filename)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save upload: {e}")
 
-    # Extract text
-    try:
-        text = extract_text_from_pdf(saved_path)
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="No extractable text found in PDF.")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to extract text from PDF: {e}")
+    existing_store = find_vectorstore(content_hash)
+    if existing_store:
+        return JSONResponse({"status": "done", "store_id": existing_store, "job_id": existing_store, "deduplicated": True}, status_code=200)
 
-    # Build vectorstore (persist directory named after uploaded filename's stem)
-    import uuid
-    persist_name = f"{uuid.uuid4().hex}_{os.path.basename(saved_path)}"
+    # Persist directory named after the content-addressed upload
+    persist_name = os.path.basename(saved_path)
     try:
-        vectordb = build_vectorstore_from_text(text, persist_dir_name=persist_name)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to build vectorstore: {e}")
+        job = get_ingestion_queue().submit(persist_name, content_hash, saved_path, file.filename)
+    except IngestionQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return {**job.to_dict(), "deduplicated": False}
 
-    return JSONResponse({"status": "ok", "store_id": persist_name})
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Progress of an ingestion job: status, pages extracted and chunks embedded so far.
+    """
+    job = get_ingestion_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No ingestion job {job_id}")
+    return job.to_dict()
+
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """
+    Cancel a queued or running ingestion job. Partially built stores are removed.
+    """
+    job = get_ingestion_queue().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No ingestion job {job_id}")
+    return job.to_dict()
 
 @app.get("/doc_qa")
-def doc_qa(q: str = Query(..., description="Question to ask the uploaded document"),
-           store_id: str = Query(..., description="store_id returned from /upload_document")):
+async def doc_qa(q: str = Query(..., description="Question to ask the uploaded documents"),
+           store_id: Optional[List[str]] = Query(None, description="store_id(s) returned from /upload_document; repeat to query several, omit to query all")):
     """
-    Query an uploaded document set. This endpoint dynamically creates a doc-specific tool and runs it.
+    Query uploaded documents. This endpoint dynamically creates a doc QA tool and runs it
+    as a single vector search over the selected documents.
     """
     try:
-        doc_tool = get_document_qa_tool(llm, persist_dir_name=store_id)
+        # Opening a store on a pool miss is blocking disk work, so keep it off the event loop
+        doc_tool = await run_in_threadpool(get_document_qa_tool, get_main_llm(), store_ids=store_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Couldn't load vectorstore for store_id={store_id}: {e}")
 
     try:
         # If you want the agent to use tools and memory to answer, you could add the doc_tool to a new agent
         # For simplicity we call the tool directly
-        answer = doc_tool.run(q)
+        answer = await doc_tool.arun(q)
         return {"question": q, "answer": answer, "store_id": store_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    
+
+@app.get("/doc_qa/stream")
+async def doc_qa_stream(request: Request,
+                        q: str = Query(..., description="Question to ask the uploaded documents"),
+                        store_id: Optional[List[str]] = Query(None, description="store_id(s) returned from /upload_document; repeat to query several, omit to query all")):
+    """
+    Server-Sent Events version of /doc_qa: answer tokens as they are generated, then a final event.
+    """
+    try:
+        qa_chain = await run_in_threadpool(get_qa_chain_pool().get, get_main_llm(), store_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Couldn't load vectorstore for store_id={store_id}: {e}")
+    return sse_response(stream_runnable(qa_chain, {"query": q}, request,
+                                        final=lambda out: {"question": q, "answer": out["result"], "store_id": store_id}))
+
+
+@app.get("/documents")
+def list_documents():
+    """
+    store_ids of every document in the shared index.
+    """
+    return {"store_ids": shared_store_ids()}
+
+
+@app.get("/embedding_cache/stats")
+def embedding_cache_stats():
+    """
+    Hit/miss counters and size of the on-disk embedding cache.
+    """
+    return get_embedding_cache().stats()
+
+
+@app.get("/llm_cache/stats")
+def llm_cache_stats():
+    """
+    Size and hit counters of the local LLM response caches (exact, and the opt-in
+    semantic one when enabled).
+    """
+    stats = {"exact": get_response_cache().stats()}
+    if get_response_cache(semantic=True) is not get_response_cache():
+        stats["semantic"] = get_response_cache(semantic=True).stats()
+    return stats
+
+
+@app.get("/sessions/stats")
+def session_stats():
+    """
+    Conversation memory: sessions currently held in memory, session files on disk and their limits,
+    and the per-session token budget.
+    """
+    return get_session_memory_store(get_main_llm()).stats()
+
+@app.get("/doc_qa/pool")
+def doc_qa_pool_stats():
+    """
+    Stores currently held open by the doc QA pool, with hit/miss counters.
+    """
+    return get_qa_chain_pool().stats()
     
     
 REDIRECT_URI = os.getenv("GOOGLE_OAUTH_REDIRECT_URI", "http://127.0.0.1:8000/google_oauth_callback")
@@ -144,6 +300,70 @@ def draft_email(to: str = Form(...), purpose: str = Form(...), context: str = Fo
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/draft_email/stream")
+async def draft_email_stream(request: Request, to: str = Form(...), purpose: str = Form(...), context: str = Form(""), tone: str = Form("polite"), length: str = Form("medium")):
+    """
+    Server-Sent Events version of /draft_email: the raw draft streams as tokens, and the
+    final event carries the parsed subject and body.
+    """
+    try:
+        validate_email_fields({"to": to, "purpose": purpose})
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    inputs = email_inputs(recipient=to, purpose=purpose, context=context, tone=tone, length=length)
+    return sse_response(stream_runnable(build_email_chain(), inputs, request,
+                                        final=lambda out: {"to": to, **parse_email_output(out["text"])}))
+
+@app.post("/draft_email/variants")
+async def draft_email_variants(payload: VariantDraftRequest):
+    """
+    Draft one email in several tone/length combinations with a single LLM call (JSON body:
+    {"to", "purpose", "context", "variants": [{"tone", "length"}, ...]}). Returns one
+    {tone, length, subject, body} per distinct combination, in request order.
+    """
+    try:
+        validate_email_fields({"to": payload.to, "purpose": payload.purpose})
+        variants = normalise_variants([(v.tone, v.length) for v in payload.variants])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        drafts = await agenerate_email_variants(payload.to, payload.purpose, payload.context, variants)
+    except ValueError as e:
+        # The model's reply didn't parse into the requested variants
+        raise HTTPException(status_code=502, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"to": payload.to, "variants": drafts}
+
+@app.post("/draft_email/bulk")
+async def draft_email_bulk(payload: BulkDraftRequest, request: Request):
+    """
+    Draft many emails in one request (JSON body: {"items": [{"to", "purpose", "context",
+    "tone", "length"}, ...]}). Server-Sent Events: a `draft` event per item as it finishes
+    ({"index", "to", "subject", "body", "raw"}, or {"index", "to", "error"}), then `done`
+    with the totals. Identical items are drafted once.
+    """
+    if len(payload.items) > EMAIL_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {EMAIL_BULK_MAX_ITEMS} items per request")
+
+    async def events():
+        drafted = failed = 0
+        drafts = draft_many(payload.items)
+        try:
+            async for result in drafts:
+                if await request.is_disconnected():
+                    break
+                if "error" in result:
+                    failed += 1
+                else:
+                    drafted += 1
+                yield sse_event("draft", result)
+            yield sse_event("done", {"drafted": drafted, "failed": failed, "total": len(payload.items)})
+        finally:
+            await drafts.aclose()
+
+    return sse_response(events())
+
 # ------------------------------------------------------------------
 # Send email endpoint
 # ------------------------------------------------------------------
@@ -184,13 +404,37 @@ def add_reminder(reminder: ReminderIn):
 
 
 @app.get("/list", response_model=List[ReminderOut])
-def list_reminders():
-    return list_reminders_logic()
+async def list_reminders(response: Response,
+                         when: Optional[str] = Query(None, description="'upcoming' (soonest first) or 'past' (most recent first)"),
+                         start: Optional[datetime] = Query(None, description="Only reminders at or after this time"),
+                         end: Optional[datetime] = Query(None, description="Only reminders before this time"),
+                         status: Optional[str] = Query(None, description="pending, delivered, failed or missed"),
+                         limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                         cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")):
+    """
+    Paginated reminders. When there are more, the X-Next-Cursor response header holds
+    the cursor for the next page.
+    """
+    try:
+        reminders, next_cursor = await alist_reminders(when=when, start=start, end=end, status=status,
+                                                       limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reminders
 
 app.include_router(router)
 
+@app.get("/ws/stats")
+def websocket_stats():
+    """
+    Connected notification clients, messages published and slow clients dropped.
+    """
+    return get_notification_hub().stats()
+
 @app.websocket("/ws")
-async def websocket_endpoint(websocket):
+async def websocket_endpoint(websocket: WebSocket):
     await reminder_ws(websocket)
 
 
@@ -0,0 +1,9 @@
+# tests/conftest.py
+import os
+import sys
+from pathlib import Path
+
+# Modules import each other as `features...` / `core...`, relative to assistant/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("GOOGLE_API_KEY", "test")
@@ -0,0 +1,33 @@
+# tests/test_gmail_client.py
+import pytest
+
+from features.email_drafter import gmail_client
+from features.email_drafter.gmail_client import GmailClient
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(gmail_client, "GMAIL_BATCH_WINDOW_SECONDS", 0.05)
+    return GmailClient(token_path=tmp_path / "token.json")
+
+
+def test_enqueue_resolves_with_each_message_result(client, monkeypatch):
+    monkeypatch.setattr(client, "send_batch", lambda messages: [
+        {"to": m["to"], "error": "invalid recipient"} if m["to"].startswith("bad") else {"to": m["to"], "id": "x"}
+        for m in messages])
+    ok = client.enqueue("a@b.c", "s", "b")
+    bad = client.enqueue("bad@b.c", "s", "b")
+    assert ok.result(timeout=5) == {"to": "a@b.c", "id": "x"}
+    with pytest.raises(RuntimeError, match="invalid recipient"):
+        bad.result(timeout=5)
+
+
+def test_enqueue_fails_every_message_when_the_batch_fails(client, monkeypatch):
+    def fail(messages):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(client, "send_batch", fail)
+    futures = [client.enqueue(f"u{i}@b.c", "s", "b") for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="connection refused"):
+            future.result(timeout=5)
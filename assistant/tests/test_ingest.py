@@ -0,0 +1,19 @@
+# tests/test_ingest.py
+from langchain.docstore.document import Document
+from langchain.vectorstores import Chroma
+
+from features.doc_qa.embeddings import HashingEmbeddings
+from features.doc_qa.ingest import chroma_sink, embed_in_batches
+
+
+def test_chroma_sink_keeps_metadata_when_some_chunks_have_none(tmp_path):
+    embedding = HashingEmbeddings(64)
+    vectordb = Chroma(collection_name="test-ingest", persist_directory=str(tmp_path), embedding_function=embedding)
+    docs = [Document(page_content="page one", metadata={"store_id": "a", "page": 1}),
+            Document(page_content="no metadata")]
+
+    count = embed_in_batches(docs, embedding, chroma_sink(vectordb, placeholder={"store_id": "a"}), batch_size=10)
+
+    assert count == 2
+    stored = {d: m for d, m in zip(*(vectordb.get()[k] for k in ("documents", "metadatas")))}
+    assert stored == {"page one": {"store_id": "a", "page": 1}, "no metadata": {"store_id": "a"}}
@@ -0,0 +1,70 @@
+# tests/test_lexical.py
+import json
+
+import pytest
+from langchain.docstore.document import Document
+
+from features.doc_qa import lexical
+from features.doc_qa.lexical import LexicalIndexBuilder, bm25_documents, bm25_search
+
+
+class _FakeChroma:
+    def __init__(self, docs):
+        self.rows = {d.id: d for d in docs}
+
+    def get(self, ids, include):
+        # Chroma does not promise to return rows in the order asked for
+        found = [self.rows[i] for i in reversed(ids) if i in self.rows]
+        return {"ids": [d.id for d in found], "documents": [d.page_content for d in found],
+                "metadatas": [d.metadata for d in found]}
+
+
+@pytest.fixture
+def lexical_base(tmp_path, monkeypatch):
+    monkeypatch.setattr(lexical, "LEXICAL_BASE", tmp_path)
+    lexical.load_lexical_index.cache_clear()
+    yield tmp_path
+    lexical.load_lexical_index.cache_clear()
+
+
+def _docs():
+    return [
+        Document(id="c1", page_content="Invoice AOE3158227 is due on 2025-03-01", metadata={"store_id": "s1", "page": 1}),
+        Document(id="c2", page_content="The refund policy covers thirty days", metadata={"store_id": "s1", "page": 2}),
+        Document(id="c3", page_content="Refund requests go to the billing team", metadata={"store_id": "s1", "page": 3}),
+    ]
+
+
+def test_index_file_holds_ids_and_postings_but_no_chunk_text(lexical_base):
+    builder = LexicalIndexBuilder("s1")
+    builder.add(_docs()[:2])
+    builder.add(_docs()[2:])
+    builder.save()
+
+    index = json.loads((lexical_base / "s1.json").read_text())
+    assert index["ids"] == ["c1", "c2", "c3"]
+    assert index["postings"]["refund"] == [1, 1, 2, 1]
+    assert "chunks" not in index
+    assert "billing team" not in (lexical_base / "s1.json").read_text()
+
+
+def test_hits_are_fetched_from_chroma_in_rank_order(lexical_base):
+    builder = LexicalIndexBuilder("s1")
+    builder.add(_docs())
+    builder.save()
+
+    hits = bm25_search(["s1"], "refund billing", k=2)
+    assert [chunk_id for chunk_id, _ in hits] == ["c3", "c2"]
+
+    docs = bm25_documents(_FakeChroma(_docs()[1:2] + _docs()[2:]), hits)
+    assert [d.page_content for d in docs] == ["Refund requests go to the billing team", "The refund policy covers thirty days"]
+    assert docs[0].metadata["page"] == 3 and docs[0].metadata["bm25_score"] > docs[1].metadata["bm25_score"]
+
+
+def test_chunks_missing_from_chroma_are_dropped(lexical_base):
+    builder = LexicalIndexBuilder("s1")
+    builder.add(_docs())
+    builder.save()
+
+    docs = bm25_documents(_FakeChroma(_docs()[:1]), bm25_search(["s1", "missing"], "AOE3158227 refund"))
+    assert [d.metadata["page"] for d in docs] == [1]
@@ -0,0 +1,35 @@
+# tests/test_llm_cache.py
+from langchain_core.outputs import Generation
+
+from core import llm_cache
+from core.llm_cache import LLMResponseCache
+from features.email_drafter.prompt_template import EMAIL_PROMPT
+
+LLM_STRING = "fake-llm"
+
+
+def email_prompt(recipient, context):
+    return EMAIL_PROMPT.format(recipient=recipient, purpose="confirm the meeting", context=context,
+                               tone="polite", length="short")
+
+
+def test_exact_cache_does_not_share_answers_between_similar_prompts(tmp_path):
+    cache = LLMResponseCache(path=tmp_path / "cache.sqlite3")
+    cache.update(email_prompt("bob@y.com", "Tuesday 5pm"), LLM_STRING, [Generation(text="Hi Bob")])
+    assert cache.lookup(email_prompt("alice@x.com", "Monday 3pm"), LLM_STRING) is None
+    assert cache.lookup(email_prompt("bob@y.com", "Tuesday 5pm"), LLM_STRING)[0].text == "Hi Bob"
+
+
+def test_semantic_tier_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_SEMANTIC", True)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", tmp_path / "exact.sqlite3")
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_SEMANTIC_PATH", tmp_path / "semantic.sqlite3")
+    monkeypatch.setattr(llm_cache, "_caches", {})
+    assert llm_cache.get_llm_cache(0).semantic is False
+    assert llm_cache.get_llm_cache(0, semantic=True).semantic is True
+
+
+def test_semantic_threshold_separates_template_prompts(tmp_path):
+    cache = LLMResponseCache(path=tmp_path / "cache.sqlite3", semantic=True)
+    cache.update(email_prompt("bob@y.com", "Tuesday 5pm"), LLM_STRING, [Generation(text="Hi Bob")])
+    assert cache.lookup(email_prompt("alice@x.com", "Monday 3pm"), LLM_STRING) is None
@@ -0,0 +1,44 @@
+# tests/test_memory.py
+import os
+import time
+
+from langchain_core.language_models.fake import FakeListLLM
+
+from core.memory import SessionMemoryStore
+
+
+def _store(tmp_path, **kwargs):
+    return SessionMemoryStore(FakeListLLM(responses=["summary"]), base_dir=tmp_path, **kwargs)
+
+
+def _session_file(tmp_path, session_id, age_seconds):
+    path = tmp_path / f"{session_id}.json"
+    path.write_text('{"summary": "", "messages": []}')
+    mtime = time.time() - age_seconds
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_expired_session_files_are_removed(tmp_path):
+    stale = _session_file(tmp_path, "stale", age_seconds=3600)
+    fresh = _session_file(tmp_path, "fresh", age_seconds=60)
+    _store(tmp_path, file_ttl_seconds=600).get("new")
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def test_new_sessions_past_the_cap_evict_the_oldest_files(tmp_path):
+    for n in range(10):
+        _session_file(tmp_path, f"s{n}", age_seconds=100 - n)
+    store = _store(tmp_path, max_files=10)
+    store.get("s0")
+    assert len(list(tmp_path.glob("*.json"))) == 10
+
+    memory = store.get("newcomer")
+    memory.save_context({"input": "hi"}, {"output": "hello"})
+    remaining = {p.stem for p in tmp_path.glob("*.json")}
+    assert len(remaining) <= 9
+    # the sessions in use survive; the least recently written idle ones go first
+    assert {"s0", "newcomer", "s9"} <= remaining
+    assert "s1" not in remaining
+    assert store.stats()["session_files"] == len(remaining)
@@ -0,0 +1,41 @@
+# tests/test_retriever.py
+import asyncio
+import threading
+from typing import List
+
+from langchain.docstore.document import Document
+from langchain_core.retrievers import BaseRetriever
+
+from features.doc_qa import retriever
+from features.doc_qa.retriever import HybridRetriever
+
+
+class _NoDense(BaseRetriever):
+    def _get_relevant_documents(self, query, *, run_manager) -> List[Document]:
+        return []
+
+
+def test_async_lexical_search_runs_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def record(name):
+        def fn(*args, **kwargs):
+            threads.append((name, threading.current_thread()))
+            return results[name]
+        return fn
+
+    results = {"registry": ["doc.pdf"], "bm25": [("chunk-1", 1.0)],
+               "fetch": [Document(page_content="hit", metadata={"store_id": "doc.pdf"})]}
+    monkeypatch.setattr(retriever, "shared_store_ids", record("registry"))
+    monkeypatch.setattr(retriever, "bm25_search", record("bm25"))
+    monkeypatch.setattr(retriever, "get_shared_vectorstore", lambda: None)
+    monkeypatch.setattr(retriever, "bm25_documents", record("fetch"))
+
+    async def scenario():
+        hybrid = HybridRetriever(vector_retriever=_NoDense(), k=3)
+        return await hybrid.ainvoke("what is the refund policy"), threading.current_thread()
+
+    docs, loop_thread = asyncio.run(scenario())
+    assert [d.page_content for d in docs] == ["hit"]
+    assert [name for name, _ in threads] == ["registry", "bm25", "fetch"]
+    assert all(thread is not loop_thread for _, thread in threads)
@@ -0,0 +1,178 @@
+# tests/test_scheduler.py
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from features.reminder import scheduler as scheduler_module
+from features.reminder.scheduler import ReminderScheduler
+from features.reminder.schema import Base, Reminder
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reminders.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(scheduler_module, "SessionLocal", factory)
+    monkeypatch.setattr(scheduler_module, "init_db", lambda: None)
+    monkeypatch.setattr(scheduler_module, "REMINDER_RETRY_BACKOFF_SECONDS", 0.05)
+    monkeypatch.setattr(scheduler_module, "REMINDER_MAX_ATTEMPTS", 3)
+    return factory
+
+
+def add_reminder(factory, remind_at):
+    session = factory()
+    reminder = Reminder(task="water plants", remind_at=remind_at)
+    session.add(reminder)
+    session.commit()
+    reminder_id = reminder.id
+    session.close()
+    return reminder_id
+
+
+def wait_for_status(factory, reminder_id, statuses, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        session = factory()
+        reminder = session.get(Reminder, reminder_id)
+        session.close()
+        if reminder.status in statuses:
+            return reminder
+        time.sleep(0.02)
+    pytest.fail(f"reminder stayed {reminder.status}")
+
+
+def test_failed_delivery_is_retried_until_it_succeeds(session_factory):
+    calls = []
+
+    def deliver(reminder_id, task):
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            raise RuntimeError("Gmail unavailable")
+
+    reminder_id = add_reminder(session_factory, datetime.now())
+    scheduler = ReminderScheduler(deliver)
+    scheduler.start()
+    try:
+        reminder = wait_for_status(session_factory, reminder_id, {"delivered", "failed"})
+    finally:
+        scheduler.stop()
+    assert (reminder.status, reminder.attempts) == ("delivered", 3)
+    assert calls[2] - calls[1] >= calls[1] - calls[0] >= 0.04
+
+
+def test_delivery_gives_up_after_max_attempts(session_factory):
+    def deliver(reminder_id, task):
+        raise RuntimeError("Gmail unavailable")
+
+    reminder_id = add_reminder(session_factory, datetime.now())
+    scheduler = ReminderScheduler(deliver)
+    scheduler.start()
+    try:
+        reminder = wait_for_status(session_factory, reminder_id, {"delivered", "failed"})
+    finally:
+        scheduler.stop()
+    assert (reminder.status, reminder.attempts) == ("failed", 3)
+
+
+def test_schedule_does_not_wait_for_the_refill_query(session_factory, monkeypatch):
+    scheduler = ReminderScheduler(lambda reminder_id, task: None)
+    scheduler.start()
+    scheduler.stop()
+    release = threading.Event()
+
+    class SlowSession:
+        def __init__(self):
+            self.session = session_factory()
+
+        def query(self, *args):
+            release.wait(5)
+            return self.session.query(*args)
+
+        def close(self):
+            self.session.close()
+
+    monkeypatch.setattr(scheduler_module, "SessionLocal", SlowSession)
+    refill = threading.Thread(target=scheduler._refill, args=(datetime.now(),))
+    refill.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    scheduler.schedule(42, datetime.now() + timedelta(minutes=1))
+    elapsed = time.monotonic() - start
+    release.set()
+    refill.join()
+    assert elapsed < 0.5
+    assert scheduler.stats()["in_memory"] == 1
+
+
+def test_second_scheduler_does_not_resend_a_reminder_being_delivered(session_factory):
+    started, release = threading.Event(), threading.Event()
+    deliveries = []
+
+    def slow_deliver(reminder_id, task):
+        deliveries.append("first")
+        started.set()
+        release.wait(5)
+
+    def deliver(reminder_id, task):
+        deliveries.append("second")
+
+    reminder_id = add_reminder(session_factory, datetime.now())
+    first = ReminderScheduler(slow_deliver)
+    first.start()
+    second = None
+    try:
+        assert started.wait(5)
+        # Another worker (re)starts while the first is still sending
+        second = ReminderScheduler(deliver)
+        second.start()
+        time.sleep(0.3)
+        release.set()
+        reminder = wait_for_status(session_factory, reminder_id, {"delivered", "failed"})
+    finally:
+        first.stop()
+        if second is not None:
+            second.stop()
+    assert deliveries == ["first"]
+    assert (reminder.status, reminder.attempts) == ("delivered", 1)
+
+
+def test_expired_sending_claim_is_recovered(session_factory, monkeypatch):
+    reminder_id = add_reminder(session_factory, datetime.now())
+    session = session_factory()
+    session.query(Reminder).filter(Reminder.id == reminder_id).update(
+        {"status": "sending", "attempts": 1, "claimed_at": datetime.now() - timedelta(hours=1)})
+    session.commit()
+    session.close()
+    monkeypatch.setattr(scheduler_module, "REMINDER_SENDING_LEASE_SECONDS", 60)
+
+    scheduler = ReminderScheduler(lambda reminder_id, task: None)
+    scheduler.start()
+    try:
+        reminder = wait_for_status(session_factory, reminder_id, {"delivered"})
+    finally:
+        scheduler.stop()
+    assert reminder.attempts == 2
+
+
+def test_notification_is_not_repeated_on_retries(session_factory):
+    notified, attempts = [], []
+
+    def deliver(reminder_id, task):
+        attempts.append(reminder_id)
+        if len(attempts) < 3:
+            raise RuntimeError("Gmail unavailable")
+
+    reminder_id = add_reminder(session_factory, datetime.now())
+    scheduler = ReminderScheduler(deliver, notify=lambda reminder_id, task: notified.append(reminder_id))
+    scheduler.start()
+    try:
+        wait_for_status(session_factory, reminder_id, {"delivered", "failed"})
+    finally:
+        scheduler.stop()
+    assert len(attempts) == 3
+    assert notified == [reminder_id]
@@ -0,0 +1,72 @@
+# tests/test_search_tool.py
+import asyncio
+import time
+
+import pytest
+
+from features.web_search import search_tool
+
+
+@pytest.fixture(autouse=True)
+def slow_search(monkeypatch):
+    calls = []
+
+    def fake_fetch(query, num_results):
+        calls.append(query)
+        time.sleep(0.3)
+        return [{"title": query, "snippet": "", "link": "http://example.com"}]
+
+    monkeypatch.setattr(search_tool, "_fetch_results", fake_fetch)
+    search_tool._cache.clear()
+    search_tool._in_flight.clear()
+    return calls
+
+
+def test_cancelled_follower_does_not_affect_leader_or_other_followers(slow_search):
+    async def scenario():
+        leader = asyncio.create_task(search_tool.aweb_search("python"))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(search_tool.aweb_search("python"))
+        other = asyncio.create_task(search_tool.aweb_search("python"))
+        await asyncio.sleep(0.05)
+        follower.cancel()
+        results = await asyncio.gather(leader, follower, other, return_exceptions=True)
+        return results
+
+    leader, follower, other = asyncio.run(scenario())
+    assert isinstance(follower, asyncio.CancelledError)
+    assert leader == other == [{"title": "python", "snippet": "", "link": "http://example.com"}]
+    assert slow_search == ["python"]
+    # The result was cached despite the cancellation
+    asyncio.run(search_tool.aweb_search("python"))
+    assert slow_search == ["python"]
+
+
+def test_cancelled_leader_hands_search_to_a_waiter(slow_search):
+    async def scenario():
+        leader = asyncio.create_task(search_tool.aweb_search("rust"))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(search_tool.aweb_search("rust"))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader, follower = asyncio.run(scenario())
+    assert isinstance(leader, asyncio.CancelledError)
+    assert follower[0]["title"] == "rust"
+    assert not search_tool._in_flight
+
+
+def test_errors_are_shared_with_waiters(monkeypatch):
+    def failing_fetch(query, num_results):
+        time.sleep(0.2)
+        raise EnvironmentError("SERPAPI_API_KEY not set")
+
+    monkeypatch.setattr(search_tool, "_fetch_results", failing_fetch)
+
+    async def scenario():
+        return await asyncio.gather(*(search_tool.aweb_search("go") for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, EnvironmentError) for r in results)
+    assert not search_tool._in_flight
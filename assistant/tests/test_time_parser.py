@@ -0,0 +1,44 @@
+# tests/test_time_parser.py
+from datetime import datetime
+
+import pytest
+
+from features.reminder.time_parser import parse_reminder
+
+NOW = datetime(2026, 10, 18, 15, 0)
+
+
+@pytest.mark.parametrize("text, task, when", [
+    ("remind me to email bob at 5pm", "email bob", "2026-10-18 17:00"),
+    ("remind me to pay rent tomorrow at 9am", "pay rent", "2026-10-19 09:00"),
+    ("remind me to stretch in 20 minutes", "stretch", "2026-10-18 15:20"),
+    ("remind me to book tickets on October 25 at 5pm", "book tickets", "2026-10-25 17:00"),
+    ("remind me to review PR 42 in 3 days", "review PR 42", "2026-10-21 15:00"),
+    ("remind me to cook at 7:00 tonight", "cook", "2026-10-18 19:00"),
+    ("remind me to jog at 6:30 in the evening", "jog", "2026-10-18 18:30"),
+    ("remind me to water plants at 9:15 in the morning", "water plants", "2026-10-19 09:15"),
+    ("remind me to start the backup at 02:15", "start the backup", "2026-10-19 02:15"),
+    ("remind me to file the report at 16:45", "file the report", "2026-10-18 16:45"),
+])
+def test_parses_supported_phrasings(text, task, when):
+    result = parse_reminder(text, now=NOW)
+    assert (result["task"], result["remind_at"].strftime("%Y-%m-%d %H:%M")) == (task, when)
+
+
+@pytest.mark.parametrize("text", [
+    "remind me to email bob at 5pm on 10/20",
+    "remind me at 9am on the 25th to pay",
+    "remind me to call the bank at 10am on 2026-10-20 or 21st",
+    "remind me to file taxes at 9am on 20.10",
+    "remind me to renew the lease next month",
+    "remind me at 6pm next week to call the plumber",
+    "remind me to clean the garage this weekend",
+    "remind me to submit the form by end of day",
+    "remind me at 3pm in november to book flights",
+    "remind me to call grandma at 6",
+    "remind me to call mom at 6:30",
+    "remind me to take the bins out at 7:00",
+    "every monday remind me to plan the week",
+])
+def test_unsupported_dates_fall_back_to_llm(text):
+    assert parse_reminder(text, now=NOW) is None
@@ -0,0 +1,41 @@
+# tests/test_vectorstore.py
+import json
+
+import pytest
+
+from features.doc_qa import vectorstore
+from features.doc_qa.embeddings import GOOGLE_EMBEDDING_MODEL
+
+
+@pytest.fixture
+def legacy_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(vectorstore, "VECTORS_BASE", tmp_path)
+    monkeypatch.setattr(vectorstore, "REGISTRY_PATH", tmp_path / "registry.json")
+    (tmp_path / "doc.pdf").mkdir()
+    (tmp_path / "registry.json").write_text(json.dumps({"abc": {"store_id": "doc.pdf", "filename": "doc.pdf"}}))
+
+
+def test_legacy_store_is_reused_with_its_own_embedding_model(legacy_store, monkeypatch):
+    monkeypatch.setattr(vectorstore, "embedding_model_name",
+                        lambda provider=None: GOOGLE_EMBEDDING_MODEL if provider in (None, "google") else "x")
+    assert vectorstore.find_vectorstore("abc") == "doc.pdf"
+
+
+def test_legacy_store_is_a_miss_under_another_embedding_model(legacy_store, monkeypatch):
+    monkeypatch.setattr(vectorstore, "embedding_model_name",
+                        lambda provider=None: GOOGLE_EMBEDDING_MODEL if provider == "google" else "local-hashing-1024")
+    assert vectorstore.find_vectorstore("abc") is None
+
+
+def test_registry_is_parsed_once_until_it_changes(legacy_store, monkeypatch):
+    reads = []
+    read_text = vectorstore.Path.read_text
+    monkeypatch.setattr(vectorstore.Path, "read_text", lambda self, *a, **kw: reads.append(self) or read_text(self, *a, **kw))
+    monkeypatch.setattr(vectorstore, "_registry_cache", None)
+
+    assert vectorstore.shared_store_ids() == []
+    assert vectorstore.shared_store_ids() == []
+    assert len(reads) == 1
+
+    vectorstore.register_vectorstore("def", "s2", "new.pdf")
+    assert vectorstore.shared_store_ids() == ["s2"]
@@ -1,14 +1,30 @@
 # logic.py
 
 import os
-from PyPDF2 import PdfReader
+import sys
+import pickle
+import hashlib
+import shutil
+from functools import lru_cache
+from pathlib import Path
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
+from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.vectorstores import FAISS
 from langchain.chains import RetrievalQA
 from dotenv import load_dotenv
 load_dotenv()
 
+# Reuse the assistant's document-QA helpers (shared on-disk embedding cache)
+ASSISTANT_DIR = Path(__file__).resolve().parent.parent / "assistant"
+if str(ASSISTANT_DIR) not in sys.path:
+    sys.path.append(str(ASSISTANT_DIR))
+from features.doc_qa.embeddings import get_embedding_model, embedding_model_slug
+from features.doc_qa.pages import iter_pdf_pages, split_pages
+
+# Built FAISS indexes, one directory per PDF content hash, namespaced by embedding model
+INDEX_DIR = Path("indexes") / embedding_model_slug()
+INDEX_DIR.mkdir(parents=True, exist_ok=True)
+
 
 
 api_key = os.getenv("GOOGLE_API_KEY")
@@ -23,11 +39,7 @@ if langchain_api_key:
 
 def load_pdf(file_path: str):
     """Extract text from PDF file"""
-    pdf_reader = PdfReader(file_path)
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text() or ""
-    return text
+    return "".join(text for _, text in iter_pdf_pages(file_path))
 
 
 def create_vectorstore(text: str):
@@ -35,15 +47,19 @@ def create_vectorstore(text: str):
     splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
     chunks = splitter.split_text(text)
 
-    embeddings = GoogleGenerativeAIEmbeddings(
-        model="models/embedding-001",
-        google_api_key=api_key
-    )
+    embeddings = get_embedding_model()
 
     vectorstore = FAISS.from_texts(chunks, embedding=embeddings)
     return vectorstore
 
 
+def create_vectorstore_from_pages(file_path: str):
+    """Stream pages out of the PDF and embed their chunks, keeping page numbers in metadata"""
+    docs = list(split_pages(iter_pdf_pages(file_path), chunk_size=1000, chunk_overlap=200))
+    embeddings = get_embedding_model()
+    return FAISS.from_documents(docs, embedding=embeddings)
+
+
 def build_qa_chain(vectorstore):
     """Build the RetrievalQA chain with Gemini"""
     llm = ChatGoogleGenerativeAI(
@@ -60,11 +76,55 @@ def build_qa_chain(vectorstore):
     return qa_chain
 
 
-def answer_query(file_path: str, query: str):
-    """Load PDF, build QA chain, and answer user query"""
-    text = load_pdf(file_path)
-    vectorstore = create_vectorstore(text)
-    qa_chain = build_qa_chain(vectorstore)
+def file_sha256(file_path: str) -> str:
+    """Content hash of a file, read in 1 MiB pieces"""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def ensure_index(file_path: str, content_hash: str) -> Path:
+    """Build and save the FAISS index for this PDF unless one already exists on disk"""
+    index_dir = INDEX_DIR / content_hash
+    if not (index_dir / "index.faiss").exists():
+        vectorstore = create_vectorstore_from_pages(file_path)
+        tmp_dir = INDEX_DIR / f"{content_hash}.tmp{os.getpid()}"
+        vectorstore.save_local(str(tmp_dir))
+        try:
+            os.replace(tmp_dir, index_dir)
+        except OSError:
+            # Another worker saved the same index first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return index_dir
+
+
+def load_index(index_dir: Path):
+    """Load a saved FAISS index, memory-mapping the vectors instead of reading them into RAM"""
+    import faiss
+    index_path = str(index_dir / "index.faiss")
+    try:
+        index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError:
+        # Index types without mmap support are read normally
+        index = faiss.read_index(index_path)
+    with open(index_dir / "index.pkl", "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    return FAISS(get_embedding_model(), index, docstore, index_to_docstore_id)
+
+
+@lru_cache(maxsize=32)
+def get_qa_chain(content_hash: str):
+    """QA chain over the saved index for `content_hash`, kept in memory for repeat questions"""
+    return build_qa_chain(load_index(INDEX_DIR / content_hash))
+
+
+def answer_query(file_path: str, query: str, content_hash: str = None):
+    """Answer a question about a PDF, reusing its saved index and chain when the same content was seen before"""
+    content_hash = content_hash or file_sha256(file_path)
+    ensure_index(file_path, content_hash)
+    qa_chain = get_qa_chain(content_hash)
 
     response = qa_chain.run(query)
-    return response
\ No newline at end of file
+    return response
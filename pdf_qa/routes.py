@@ -1,6 +1,7 @@
 
 import os
-import shutil
+import hashlib
+import tempfile
 from fastapi import FastAPI, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
 from main import answer_query
@@ -22,12 +23,17 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 @app.post("/ask-pdf/")
 async def ask_pdf(file: UploadFile, query: str = Form(...)):
-    file_path = os.path.join(UPLOAD_FOLDER, file.filename)
-
-    # Save uploaded file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Save uploaded file under its content hash, so different PDFs with the same name never overwrite each other
+    hasher = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_FOLDER, suffix=".part")
+    with os.fdopen(fd, "wb") as buffer:
+        for chunk in iter(lambda: file.file.read(1024 * 1024), b""):
+            hasher.update(chunk)
+            buffer.write(chunk)
+    content_hash = hasher.hexdigest()
+    file_path = os.path.join(UPLOAD_FOLDER, f"{content_hash}.pdf")
+    os.replace(tmp_path, file_path)
 
     # Get answer from Gemini
-    answer = answer_query(file_path, query)
-    return {"answer": answer}
\ No newline at end of file
+    answer = answer_query(file_path, query, content_hash=content_hash)
+    return {"answer": answer}
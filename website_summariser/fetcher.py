@@ -0,0 +1,254 @@
+# fetcher.py
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Extracted page text, keyed by URL, with the validators needed to revalidate it
+FETCH_CACHE_DIR = Path(os.getenv("FETCH_CACHE_DIR", Path(__file__).resolve().parent / ".page_cache"))
+# Cached pages younger than this are served without asking the server (0 = always revalidate)
+FETCH_FRESH_SECONDS = int(os.getenv("FETCH_FRESH_SECONDS", "0"))
+# Past either limit the least recently used pages are evicted, down to 90% of it
+FETCH_CACHE_MAX_ENTRIES = int(os.getenv("FETCH_CACHE_MAX_ENTRIES", "1000"))
+FETCH_CACHE_MAX_BYTES = int(os.getenv("FETCH_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+FETCH_TIMEOUT_SECONDS = float(os.getenv("FETCH_TIMEOUT_SECONDS", "10"))
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(5 * 1024 * 1024)))
+FETCH_POOL_SIZE = int(os.getenv("FETCH_POOL_SIZE", "10"))
+FETCH_USER_AGENT = os.getenv("FETCH_USER_AGENT", "Mozilla/5.0 (compatible; website-summariser)")
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+_BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "tr", "td", "th", "table", "section", "article",
+               "header", "footer", "nav", "aside", "main", "h1", "h2", "h3", "h4", "h5", "h6",
+               "pre", "blockquote", "form", "hr", "title", "dt", "dd"}
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Single pass over the HTML collecting visible text, with a line break at block
+    elements. Much cheaper than building a BeautifulSoup tree just to call get_text().
+    Unlike get_text(separator="\n"), inline elements stay on their line
+    ("<p>Hello <b>world</b></p>" gives "Hello world"), and noscript/template/svg
+    content is skipped along with script/style.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+
+def extract_text(html: str) -> str:
+    """Visible text of an HTML page, one non-empty stripped line per text block"""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    text = "".join(parser.parts)
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared session: keep-alive connections are reused across fetches"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+            adapter = HTTPAdapter(pool_connections=FETCH_POOL_SIZE, pool_maxsize=FETCH_POOL_SIZE, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = FETCH_USER_AGENT
+            _session = session
+    return _session
+
+
+stats = {"fresh": 0, "not_modified": 0, "unchanged": 0, "downloaded": 0, "evicted": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(event: str, n: int = 1) -> None:
+    with _stats_lock:
+        stats[event] += n
+
+
+def fetch_stats() -> dict:
+    with _stats_lock:
+        return dict(stats)
+
+
+def _cache_path(url: str) -> Path:
+    return FETCH_CACHE_DIR / (hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+
+def _load_entry(url: str) -> Optional[dict]:
+    path = _cache_path(url)
+    try:
+        entry = json.loads(path.read_text())
+        # mtime doubles as the last-used time for eviction
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("url") == url else None
+
+
+_cache_lock = threading.Lock()
+_cache_usage = None  # [entries, bytes], from one directory scan, then kept up to date by _save_entry
+
+
+def _scan_cache() -> list:
+    files = []
+    for path in FETCH_CACHE_DIR.glob("*.json"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        files.append((st.st_mtime, st.st_size, path))
+    return files
+
+
+def _save_entry(url: str, entry: dict) -> None:
+    global _cache_usage
+    FETCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _cache_path(url)
+    data = json.dumps(entry).encode()
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    with _cache_lock:
+        if _cache_usage is None:
+            files = _scan_cache()
+            _cache_usage = [len(files), sum(size for _, size, _ in files)]
+        try:
+            old_size = path.stat().st_size
+            _cache_usage[1] -= old_size
+        except OSError:
+            _cache_usage[0] += 1
+        os.replace(tmp, path)
+        _cache_usage[1] += len(data)
+        if _cache_usage[0] > FETCH_CACHE_MAX_ENTRIES or _cache_usage[1] > FETCH_CACHE_MAX_BYTES:
+            _evict()
+
+
+def _evict() -> None:
+    # Called with _cache_lock held
+    files = sorted(_scan_cache())
+    entries, size = len(files), sum(s for _, s, _ in files)
+    evicted = 0
+    for _, file_size, path in files:
+        if entries <= FETCH_CACHE_MAX_ENTRIES * 0.9 and size <= FETCH_CACHE_MAX_BYTES * 0.9:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        entries -= 1
+        size -= file_size
+        evicted += 1
+    _cache_usage[:] = [entries, size]
+    _count("evicted", evicted)
+
+
+def _read_body(response: requests.Response, max_bytes: int) -> bytes:
+    length = response.headers.get("Content-Length")
+    if length and length.isdigit() and int(length) > max_bytes:
+        raise ValueError(f"Page is larger than {max_bytes} bytes")
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=65536):
+        body += chunk
+        if len(body) > max_bytes:
+            raise ValueError(f"Page is larger than {max_bytes} bytes")
+    return bytes(body)
+
+
+def _decode(response: requests.Response, body: bytes) -> str:
+    # requests assumes ISO-8859-1 for text/* without a charset; prefer the page's own <meta charset>
+    encoding = None
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        encoding = response.encoding
+    if encoding is None:
+        match = _META_CHARSET_RE.search(body[:2048])
+        encoding = match.group(1).decode() if match else "utf-8"
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def fetch_page_text(url: str, max_bytes: int = FETCH_MAX_BYTES) -> str:
+    """
+    Readable text of `url`. Pages are cached on disk with their ETag/Last-Modified, and a
+    repeat fetch sends a conditional GET: a 304 (or a byte-identical body) reuses the cached
+    text without re-downloading or re-parsing. The cache is capped at FETCH_CACHE_MAX_ENTRIES
+    pages / FETCH_CACHE_MAX_BYTES, least recently used first out. Bodies over `max_bytes`
+    raise ValueError.
+    """
+    entry = _load_entry(url)
+    if entry and FETCH_FRESH_SECONDS and time.time() - entry["fetched_at"] < FETCH_FRESH_SECONDS:
+        _count("fresh")
+        return entry["text"]
+
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    with get_session().get(url, headers=headers, timeout=FETCH_TIMEOUT_SECONDS, stream=True) as response:
+        if response.status_code == 304 and entry:
+            _count("not_modified")
+            entry["fetched_at"] = time.time()
+            _save_entry(url, entry)
+            return entry["text"]
+        response.raise_for_status()
+        body = _read_body(response, max_bytes)
+        digest = hashlib.sha256(body).hexdigest()
+        if entry and entry.get("sha256") == digest:
+            _count("unchanged")
+            text = entry["text"]
+        else:
+            _count("downloaded")
+            content = _decode(response, body)
+            content_type = response.headers.get("Content-Type", "").lower()
+            is_html = "html" in content_type or (not content_type and "<html" in content[:1024].lower())
+            text = extract_text(content) if is_html else content.strip()
+        _save_entry(url, {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": digest,
+            "fetched_at": time.time(),
+            "text": text,
+        })
+    return text
@@ -1,5 +1,4 @@
-import requests
-from bs4 import BeautifulSoup
+from fetcher import fetch_page_text
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains.summarize import load_summarize_chain
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -11,18 +10,8 @@ load_dotenv()
 api_key = os.getenv("GOOGLE_API_KEY")
 
 def fetch_website_text(url: str) -> str:
-    """Fetch website HTML and extract readable text"""
-    response = requests.get(url, timeout=10)
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    # Remove scripts/styles
-    for tag in soup(["script", "style"]):
-        tag.decompose() 
-
-    text = soup.get_text(separator="\n")
-    # Clean multiple newlines
-    text = "\n".join([line.strip() for line in text.splitlines() if line.strip()])
-    return text
+    """Fetch website HTML and extract readable text (pooled, size-limited, cached on disk)"""
+    return fetch_page_text(url)
 
 def summarize_website(url: str) -> str:
     """Fetch website and summarize content using Gemini"""
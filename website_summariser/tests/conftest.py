@@ -0,0 +1,6 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# The app imports its modules by bare name (`from logic import ...`), relative to website_summariser/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,84 @@
+# tests/test_fetcher.py
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import fetcher
+
+PAGE = b"<html><head><title>Hi</title><script>var x = 1</script></head><body><p>Hello <b>world</b></p></body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    etag = '"v1"'
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        _Handler.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/big":
+            body = b"x" * 4096
+        else:
+            body = PAGE
+            if self.path == "/etag" and self.headers.get("If-None-Match") == self.etag:
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if self.path == "/etag":
+            self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    _Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetcher, "FETCH_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(fetcher, "_cache_usage", None)
+    for key in fetcher.stats:
+        monkeypatch.setitem(fetcher.stats, key, 0)
+    return tmp_path
+
+
+def test_revalidates_with_etag_and_reuses_text_on_304(server):
+    first = fetcher.fetch_page_text(server + "/etag")
+    second = fetcher.fetch_page_text(server + "/etag")
+    assert first == second == "Hi\nHello world"
+    assert _Handler.requests == [("/etag", None), ("/etag", '"v1"')]
+    assert fetcher.fetch_stats()["not_modified"] == 1
+
+
+def test_unchanged_body_without_validators_is_not_reparsed(server, monkeypatch):
+    fetcher.fetch_page_text(server + "/plain")
+    monkeypatch.setattr(fetcher, "extract_text", lambda html: pytest.fail("re-parsed an unchanged page"))
+    assert fetcher.fetch_page_text(server + "/plain") == "Hi\nHello world"
+    assert fetcher.fetch_stats()["unchanged"] == 1
+
+
+def test_rejects_bodies_over_the_size_cap(server):
+    with pytest.raises(ValueError, match="larger than"):
+        fetcher.fetch_page_text(server + "/big", max_bytes=1024)
+
+
+def test_cache_is_capped(server, cache_dir, monkeypatch):
+    monkeypatch.setattr(fetcher, "FETCH_CACHE_MAX_ENTRIES", 5)
+    for i in range(12):
+        fetcher.fetch_page_text(f"{server}/plain?{i}")
+    assert len(list(cache_dir.glob("*.json"))) <= 5
+    assert fetcher.fetch_stats()["evicted"] >= 7